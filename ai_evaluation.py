@@ -0,0 +1,179 @@
+"""
+Asynchronous AI conformity evaluation.
+
+Sends one chat-completion request per (site, scanner) pair with httpx.
+Concurrency is bounded by a semaphore, transient failures are retried with
+exponential backoff, and a rate-limit response pauses every request until
+the API's reset time. Results are handed back in batches so the caller can
+write them in one transaction each.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever SYSTEM_PROMPT or build_messages change so cached
+# evaluations of the old prompt are no longer reused
+PROMPT_VERSION = 1
+
+SYSTEM_PROMPT = (
+    'You are a CT scanner preinstallation engineer. Assess whether the site '
+    'can host the scanner, list blocking issues first, then recommendations. '
+    'Be concise.'
+)
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+MAX_BACKOFF = 60.0
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|s|m|h)')
+_DURATION_UNITS = {'ms': 0.001, 's': 1.0, 'm': 60.0, 'h': 3600.0}
+
+
+class EvaluationError(Exception):
+    pass
+
+
+def parse_reset(value):
+    """Seconds from a Retry-After or x-ratelimit-reset-* header ('20', '1.5s', '6m0s')"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        parts = _DURATION_PART.findall(value)
+        if not parts:
+            return None
+        return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+def _format_values(values):
+    return '\n'.join(f'- {name}: {value}' for name, value in values.items()
+                     if value is not None)
+
+
+def build_messages(job):
+    """Chat messages for one job dict with 'site', 'scanner' and 'assessment' keys"""
+    content = (
+        f"Site specification:\n{_format_values(job['site'])}\n\n"
+        f"Scanner model requirements:\n{_format_values(job['scanner'])}\n\n"
+        f"Automated dimensional check:\n{_format_values(job['assessment'])}"
+    )
+    return [
+        {'role': 'system', 'content': SYSTEM_PROMPT},
+        {'role': 'user', 'content': content},
+    ]
+
+
+def cache_key(job, model):
+    """Content address of the request a job produces: prompt version, model and messages"""
+    canonical = json.dumps(
+        {'prompt_version': PROMPT_VERSION, 'model': model, 'messages': build_messages(job)},
+        sort_keys=True, separators=(',', ':'),
+    )
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class EvaluationClient:
+    """Evaluates jobs against an OpenAI-compatible chat completions endpoint"""
+
+    def __init__(self, api_key, base_url='https://api.openai.com/v1', model='gpt-4o-mini',
+                 concurrency=4, max_retries=5, backoff=1.0, timeout=60.0, transport=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.model = model
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.transport = transport
+        self._resume_at = 0.0
+
+    async def run(self, jobs, on_batch, batch_size=50):
+        """
+        Evaluate every job and pass results to `on_batch` as lists of
+        {'id', 'ai_evaluation_text'} mappings. Jobs that still fail after
+        the retries are logged and left out, so they stay pending.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+        pending = []
+        stats = {'evaluated': 0, 'failed': 0}
+
+        async def evaluate_one(http, job):
+            async with semaphore:
+                try:
+                    text = await self.evaluate(http, job)
+                except EvaluationError as ex:
+                    logger.warning('AI evaluation of report %s failed: %s', job['id'], ex)
+                    stats['failed'] += 1
+                    return
+            pending.append({'id': job['id'], 'ai_evaluation_text': text})
+            stats['evaluated'] += 1
+            if len(pending) >= batch_size:
+                on_batch(pending[:])
+                pending.clear()
+
+        headers = {'Authorization': f'Bearer {self.api_key}'}
+        async with httpx.AsyncClient(base_url=self.base_url, headers=headers,
+                                     timeout=self.timeout, transport=self.transport) as http:
+            await asyncio.gather(*(evaluate_one(http, job) for job in jobs))
+
+        if pending:
+            on_batch(pending[:])
+        return stats
+
+    async def evaluate(self, http, job):
+        payload = {'model': self.model, 'messages': build_messages(job), 'temperature': 0}
+
+        for attempt in range(self.max_retries + 1):
+            await self._wait_for_rate_limit()
+            try:
+                response = await http.post('/chat/completions', json=payload)
+            except httpx.TransportError as ex:
+                error = f'{type(ex).__name__}: {ex}'
+                delay = None
+            else:
+                self._note_rate_limit(response)
+                if response.status_code == 200:
+                    try:
+                        return response.json()['choices'][0]['message']['content']
+                    except (ValueError, KeyError, IndexError) as ex:
+                        raise EvaluationError(f'malformed response: {ex}')
+                if response.status_code not in RETRY_STATUSES:
+                    raise EvaluationError(f'HTTP {response.status_code}: {response.text[:200]}')
+                error = f'HTTP {response.status_code}'
+                delay = parse_reset(response.headers.get('retry-after'))
+
+            if attempt == self.max_retries:
+                break
+            if delay is None:
+                delay = min(self.backoff * 2 ** attempt, MAX_BACKOFF)
+                delay += random.uniform(0, self.backoff)
+            logger.info('Retrying report %s in %.1fs after %s', job['id'], delay, error)
+            await asyncio.sleep(delay)
+
+        raise EvaluationError(f'gave up after {self.max_retries + 1} attempts: {error}')
+
+    async def _wait_for_rate_limit(self):
+        delay = self._resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _note_rate_limit(self, response):
+        # A 429, or a success that used up the request budget, pauses every
+        # worker until the window resets instead of letting each one retry
+        reset = None
+        if response.status_code == 429:
+            reset = parse_reset(response.headers.get('retry-after')) or \
+                parse_reset(response.headers.get('x-ratelimit-reset-requests'))
+        elif response.headers.get('x-ratelimit-remaining-requests') == '0':
+            reset = parse_reset(response.headers.get('x-ratelimit-reset-requests'))
+        if reset:
+            self._resume_at = max(self._resume_at, time.monotonic() + reset)
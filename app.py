@@ -1,27 +1,59 @@
+import asyncio
+import collections
+import itertools
 import os
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import click
 import flask_sqlalchemy
-from flask import Flask, redirect, url_for, render_template_string
+from flask import (Blueprint, Flask, abort, current_app, flash, has_app_context, jsonify, redirect,
+                   render_template, request, send_file, url_for)
+from jinja2 import FileSystemBytecodeCache
+from werkzeug.local import LocalProxy
 from flask_sqlalchemy import SQLAlchemy
 from flask_admin import Admin, BaseView, expose, AdminIndexView
+from flask_admin.actions import action
 from flask_admin.contrib.sqla import ModelView
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import NamedTuple
+from sqlalchemy import DDL, event, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import joinedload, object_session, validates
 
-# Create Flask app
-app = Flask(__name__)
+try:
+    from flask_babel import Babel
+except ImportError:  # Flask-Admin falls back to untranslated strings
+    Babel = None
 
-# Configuration with your real keys
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', os.urandom(24).hex())
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///ct_install.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-app.config['APP_NAME'] = 'CT Scanner Preinstallation Manager'
+import conformity
+import instrumentation
+import metrics
+import power_spec
+import project_summary
+import search
+import seed_data
+import sqlite_pragmas
+from config import config
 
+# Bound to an app by create_app; models, views and routes are declared
+# against these without building an app at import time
+db = SQLAlchemy()
+bp = Blueprint('main', __name__, cli_group=None)
 
-# Disable Flask-Admin's Babel requirement
-app.config['BABEL_DEFAULT_LOCALE'] = 'en'
-app.config['BABEL_DEFAULT_TIMEZONE'] = 'UTC'
-
-# Initialize extensions
-db = SQLAlchemy(app)
+def app_state(name):
+    """
+    The current app's instance of a process-local cache, created by
+    create_app and kept in app.extensions so two apps in one process (tests
+    against different databases) never share settings or cached rows
+    """
+    return LocalProxy(lambda: current_app.extensions['ct_scanner'][name])
 
 # ================================================
 # MODELS (Enhanced with all features)
@@ -33,16 +65,37 @@ class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text)
-    status = db.Column(db.String(50), default='draft')
+    status = db.Column(db.String(50), default='draft', index=True)
     client_name = db.Column(db.String(100))
     engineer_name = db.Column(db.String(100))
-    created_on = db.Column(db.DateTime, default=datetime.utcnow)
+    created_on = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    # Written only by the project_summary triggers
+    summary = db.relationship('ProjectSummary', uselist=False, viewonly=True)
     
     def __repr__(self):
         return self.name or f'Project {self.id}'
 
+class ProjectSummary(db.Model):
+    __tablename__ = 'project_summary'
+    
+    # Rollups of the project's sites and their conformity reports
+    project_id = db.Column(db.Integer, db.ForeignKey('project.id'), primary_key=True)
+    site_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    report_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    pass_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    fail_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    best_score = db.Column(db.Float)
+    total_estimated_cost = db.Column(db.Float, nullable=False, default=0, server_default='0')
+    
+    def __repr__(self):
+        return f'Summary of project {self.project_id}'
+
 class SiteSpecification(db.Model):
     __tablename__ = 'site_specification'
+    __table_args__ = (
+        db.Index('ix_site_specification_project_id_created_on', 'project_id', 'created_on'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     project_id = db.Column(db.Integer, db.ForeignKey('project.id'), nullable=False)
@@ -59,21 +112,38 @@ class SiteSpecification(db.Model):
     electrical_power = db.Column(db.String(100))
     hvac_system = db.Column(db.String(100))
     
+    # Parsed from electrical_power when it is set
+    supply_voltage = db.Column(db.Float)  # V
+    supply_kva = db.Column(db.Float, index=True)
+    supply_phase = db.Column(db.Integer)
+    
     # Dates
-    created_on = db.Column(db.DateTime, default=datetime.utcnow)
+    created_on = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Relationship
     project = db.relationship('Project', backref='site_specs')
     
+    @validates('electrical_power')
+    def _parse_electrical_power(self, key, value):
+        self.supply_voltage, self.supply_kva, self.supply_phase = power_spec.parse_power(value)
+        return value
+    
     def __repr__(self):
         return f'Site Spec for {self.project.name if self.project else "Unknown"}'
 
 class ScannerModel(db.Model):
     __tablename__ = 'scanner_model'
+    __table_args__ = (
+        db.Index('ix_scanner_model_power_phase_power_kva', 'power_phase', 'power_kva'),
+        # Covers fitting_scanners_query, so fit lookups never touch the table
+        db.Index('ix_scanner_model_fit', 'min_room_length', 'min_room_width', 'min_room_height',
+                 'min_door_width', 'weight', 'power_kva', 'power_phase', 'power_voltage',
+                 'name', 'manufacturer'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
-    manufacturer = db.Column(db.String(100))
+    manufacturer = db.Column(db.String(100), index=True)
     weight = db.Column(db.Float)  # kg
     min_room_length = db.Column(db.Float)  # m
     min_room_width = db.Column(db.Float)   # m
@@ -82,11 +152,31 @@ class ScannerModel(db.Model):
     power_requirement = db.Column(db.String(50))
     special_requirements = db.Column(db.Text)
     
+    # Parsed from power_requirement when it is set
+    power_voltage = db.Column(db.Float)  # V
+    power_kva = db.Column(db.Float)
+    power_phase = db.Column(db.Integer)
+    
+    @validates('power_requirement')
+    def _parse_power_requirement(self, key, value):
+        self.power_voltage, self.power_kva, self.power_phase = power_spec.parse_power(value)
+        return value
+    
     def __repr__(self):
         return f'{self.name} ({self.manufacturer})'
 
 class ConformityReport(db.Model):
     __tablename__ = 'conformity_report'
+    __table_args__ = (
+        db.Index('ix_conformity_report_site_spec_id_created_on', 'site_spec_id', 'created_on'),
+        db.Index('ix_conformity_report_scanner_model_id_created_on', 'scanner_model_id', 'created_on'),
+        # Only the few stale rows are indexed
+        db.Index('ix_conformity_report_stale', 'id', sqlite_where=db.text('stale = 1')),
+        # Reports waiting for an AI evaluation: the queue-depth gauge and
+        # pending_ai_jobs read this instead of scanning every report
+        db.Index('ix_conformity_report_ai_pending', 'id',
+                 sqlite_where=db.text('ai_evaluation_text IS NULL')),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     site_spec_id = db.Column(db.Integer, db.ForeignKey('site_specification.id'), nullable=False)
@@ -98,9 +188,14 @@ class ConformityReport(db.Model):
     pass_fail = db.Column(db.Boolean)
     critical_issues = db.Column(db.Integer, default=0)
     estimated_cost = db.Column(db.Float)
+
+    # Site then scanner conformity.row_fingerprints of the scored inputs;
+    # `stale` is set when either input changes and cleared once rescored
+    input_fingerprint = db.Column(db.String(32))
+    stale = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
     
     # Timestamps
-    created_on = db.Column(db.DateTime, default=datetime.utcnow)
+    created_on = db.Column(db.DateTime, default=datetime.utcnow, index=True)
     
     # Relationships
     site_spec = db.relationship('SiteSpecification', backref='conformity_reports')
@@ -109,6 +204,445 @@ class ConformityReport(db.Model):
     def __repr__(self):
         return f'Conformity Report {self.id} - Score: {self.conformity_score}%'
 
+class AIEvaluationCache(db.Model):
+    __tablename__ = 'ai_evaluation_cache'
+    
+    # sha256 of prompt version, model and messages (ai_evaluation.cache_key)
+    key = db.Column(db.String(64), primary_key=True)
+    prompt_version = db.Column(db.Integer, nullable=False)
+    model = db.Column(db.String(100))
+    evaluation_text = db.Column(db.Text, nullable=False)
+    size = db.Column(db.Integer, nullable=False)  # bytes of evaluation_text
+    hits = db.Column(db.Integer, default=0, nullable=False)
+    created_on = db.Column(db.DateTime, default=datetime.utcnow)
+    last_used_on = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    def __repr__(self):
+        return f'AI Evaluation {self.key[:12]}'
+
+class CatalogVersion(db.Model):
+    __tablename__ = 'catalog_version'
+    
+    # One row per cached table, bumped in the transaction that changes it
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+class Job(db.Model):
+    __tablename__ = 'job'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # a JOB_HANDLERS key
+    payload = db.Column(db.JSON)
+    priority = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    run_after = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Held by the claiming worker and renewed by its heartbeat; a job whose
+    # lease runs out goes back to the queue
+    lease_token = db.Column(db.String(32), unique=True)
+    lease_expires = db.Column(db.DateTime)
+    heartbeat_on = db.Column(db.DateTime)
+    worker = db.Column(db.String(100))
+    
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    created_on = db.Column(db.DateTime, default=datetime.utcnow)
+    started_on = db.Column(db.DateTime)
+    finished_on = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'Job {self.id} {self.kind} ({self.status})'
+
+# Matches the claim order (highest priority, then oldest), so the next job
+# is read off the index without a sort
+db.Index('ix_job_status_priority', Job.status, Job.priority.desc(), Job.id)
+
+# ================================================
+# DASHBOARD STATISTICS (cached)
+# ================================================
+
+class DashboardStats:
+    """TTL cache of the dashboard counts and recent projects, one per app"""
+    metric_name = 'dashboard_stats'  # label on the metrics.CACHE_LOOKUPS counter
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._value = None
+        self._expires = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        value = self._value
+        if value is not None and time.monotonic() < self._expires:
+            metrics.cache_lookup(self.metric_name, True)
+            return value
+        with self._lock:
+            if self._value is not None and time.monotonic() < self._expires:
+                metrics.cache_lookup(self.metric_name, True)
+                return self._value
+            metrics.cache_lookup(self.metric_name, False)
+            generation = self._generation
+            value = self._load()
+            # Skip storing if an invalidation raced with the load
+            if generation == self._generation:
+                self._value = value
+                self._expires = time.monotonic() + self.ttl
+            return value
+
+    def invalidate(self):
+        self._generation += 1
+        self._value = None
+
+    def _load(self):
+        def count(model):
+            return db.select(db.func.count()).select_from(model.__table__).scalar_subquery()
+
+        counts = db.session.query(
+            count(Project).label('project_count'),
+            count(ScannerModel).label('scanner_count'),
+            count(SiteSpecification).label('site_count'),
+            count(ConformityReport).label('report_count'),
+        ).one()
+
+        recent_projects = db.session.query(
+            Project.id, Project.name, Project.status, Project.client_name, Project.created_on,
+            ProjectSummary.site_count, ProjectSummary.best_score
+        ).outerjoin(ProjectSummary).order_by(Project.created_on.desc()).limit(5).all()
+
+        stats = counts._asdict()
+        stats['recent_projects'] = [row._asdict() for row in recent_projects]
+        return stats
+
+dashboard_stats = app_state('dashboard_stats')
+
+def invalidate_cached_counts():
+    dashboard_stats.invalidate()
+    list_count_cache.clear()
+
+def _invalidate_dashboard_stats(mapper, connection, target):
+    invalidate_cached_counts()
+    session = object_session(target)
+    if session is not None:
+        session.info['dashboard_stats_dirty'] = True
+
+for _model in (Project, ScannerModel, SiteSpecification, ConformityReport):
+    event.listen(_model, 'after_insert', _invalidate_dashboard_stats)
+    event.listen(_model, 'after_delete', _invalidate_dashboard_stats)
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_dashboard_stats_on_commit(session):
+    # Counts read between flush and commit would be cached stale otherwise
+    if session.info.pop('dashboard_stats_dirty', False):
+        invalidate_cached_counts()
+
+# ================================================
+# SCANNER CATALOG (in-memory snapshot)
+# ================================================
+
+ScannerRecord = collections.namedtuple(
+    'ScannerRecord',
+    ('id', 'name', 'manufacturer') + conformity.SCANNER_FIELDS +
+    ('power_requirement', 'special_requirements'),
+)
+
+class CatalogSnapshot(NamedTuple):
+    """Immutable copy of scanner_model; `matrix` rows follow `records`"""
+    version: int
+    records: tuple
+    by_id: dict
+    matrix: object  # read-only float array of conformity.SCANNER_FIELDS
+
+def read_catalog_version(connection=None):
+    query = db.select(CatalogVersion.version).where(CatalogVersion.name == ScannerModel.__tablename__)
+    version = (connection or db.session).execute(query).scalar()
+    return version or 0
+
+def bump_catalog_version(connection):
+    """Mark the scanner catalog changed; call inside the writing transaction"""
+    connection.execute(
+        sqlite_insert(CatalogVersion.__table__)
+        .values(name=ScannerModel.__tablename__, version=1)
+        .on_conflict_do_update(index_elements=['name'],
+                               set_={'version': CatalogVersion.__table__.c.version + 1})
+    )
+
+class ScannerCatalog:
+    """
+    Per-app snapshot of the scanner catalog. Commits in this process
+    that touch scanner_model drop it at once; changes made by other workers
+    are noticed through catalog_version, read at most every
+    `check_interval` seconds.
+    """
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self._snapshot = None
+        self._checked = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() - self._checked < self.check_interval:
+            metrics.cache_lookup('scanner_catalog', True)
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and time.monotonic() - self._checked < self.check_interval:
+                metrics.cache_lookup('scanner_catalog', True)
+                return snapshot
+            generation = self._generation
+            version = read_catalog_version()
+            stale = snapshot is None or snapshot.version != version
+            metrics.cache_lookup('scanner_catalog', not stale)
+            if stale:
+                snapshot = self._load(version)
+            # Skip storing if an invalidation raced with the load
+            if generation == self._generation:
+                self._snapshot = snapshot
+                self._checked = time.monotonic()
+            return snapshot
+
+    def invalidate(self):
+        self._generation += 1
+        self._snapshot = None
+
+    def _load(self, version):
+        columns = [getattr(ScannerModel, name) for name in ScannerRecord._fields]
+        records = tuple(ScannerRecord(*row) for row in
+                        db.session.query(*columns).order_by(ScannerModel.id))
+        matrix = conformity.as_matrix(
+            [[getattr(record, name) for name in conformity.SCANNER_FIELDS] for record in records],
+            len(conformity.SCANNER_FIELDS))
+        matrix.setflags(write=False)
+        return CatalogSnapshot(version=version, records=records,
+                               by_id={record.id: record for record in records}, matrix=matrix)
+
+    def fitting(self, site):
+        """ScannerRecords that fit `site`, scored with conformity.score_matrix"""
+        snapshot = self.get()
+        if not snapshot.records:
+            return []
+        values = [site.get(name) for name in conformity.SITE_FIELDS]
+        passed = conformity.score_matrix([values], snapshot.matrix).pass_fail[0].tolist()
+        return [record for record, ok in zip(snapshot.records, passed) if ok]
+
+scanner_catalog = app_state('scanner_catalog')
+
+@event.listens_for(db.session, 'after_flush')
+def _bump_scanner_catalog_version(session, flush_context):
+    # session.new/dirty/deleted still hold the flushed objects here. A
+    # scanner is dirty too when only a backref collection changed (a new
+    # report appended to conformity_reports); that leaves the catalog as is.
+    # Bulk operations bypass the flush and must call bump_catalog_version.
+    dirty = (obj for obj in session.dirty
+             if session.is_modified(obj, include_collections=False))
+    if any(isinstance(obj, ScannerModel)
+           for obj in itertools.chain(session.new, dirty, session.deleted)):
+        bump_catalog_version(session.connection())
+        session.info['scanner_catalog_dirty'] = True
+
+@event.listens_for(db.session, 'after_commit')
+def _invalidate_scanner_catalog_on_commit(session):
+    if session.info.pop('scanner_catalog_dirty', False):
+        scanner_catalog.invalidate()
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_scanner_catalog_changes(session):
+    session.info.pop('scanner_catalog_dirty', None)
+
+# ================================================
+# KEYSET PAGINATION
+# ================================================
+
+def encode_cursor(created_on, pk):
+    return f'{created_on.isoformat()},{pk}'
+
+def decode_cursor(value):
+    """Parse an `after` cursor; returns None for missing or malformed values"""
+    if not value:
+        return None
+    try:
+        created_on, pk = value.rsplit(',', 1)
+        return datetime.fromisoformat(created_on), int(pk)
+    except ValueError:
+        return None
+
+def apply_keyset(query, model, cursor, limit):
+    """Order newest first on (created_on, id) and seek past `cursor`"""
+    if cursor is not None:
+        query = query.filter(tuple_(model.created_on, model.id) < tuple_(*cursor))
+    query = query.order_by(model.created_on.desc(), model.id.desc())
+    if limit:
+        query = query.limit(limit)
+    return query
+
+class CountCache:
+    """Short-lived cache of filtered list counts, keyed on the list arguments"""
+
+    def __init__(self, ttl, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def get(self, key, compute):
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None and entry[1] > now:
+            metrics.cache_lookup('list_counts', True)
+            return entry[0]
+        metrics.cache_lookup('list_counts', False)
+        value = compute()
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (value, now + self.ttl)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+list_count_cache = app_state('list_count_cache')
+
+class KeysetPaginationMixin:
+    """
+    Pages the default newest-first list with an `after` cursor on
+    (created_on, id) instead of OFFSET, and reads the total from cached counts.
+    Custom sorts and explicit page numbers fall back to OFFSET paging.
+    """
+    list_template = 'admin/model/keyset_list.html'
+    column_default_sort = [('created_on', True), ('id', True)]
+    # DashboardStats key holding the unfiltered total
+    keyset_count_key = None
+
+    def get_list(self, page, sort_column, sort_desc, search, filters,
+                 execute=True, page_size=None):
+        cursor = None
+        # Flask-Admin carries extra query args into export links; only the
+        # list page itself seeks
+        if request.endpoint == f'{self.endpoint}.index_view':
+            cursor = decode_cursor(request.args.get('after'))
+        if sort_column is not None or (page and cursor is None):
+            return super().get_list(page, sort_column, sort_desc, search, filters,
+                                    execute=execute, page_size=page_size)
+
+        joins, count_joins = {}, {}
+        query = self.get_query()
+        count_query = self.get_count_query()
+
+        if self._search_supported and search:
+            query, count_query, joins, count_joins = self._apply_search(
+                query, count_query, joins, count_joins, search)
+        if filters and self._filters:
+            query, count_query, joins, count_joins = self._apply_filters(
+                query, count_query, joins, count_joins, filters)
+
+        if not search and not filters and self.keyset_count_key:
+            count = dashboard_stats.get()[self.keyset_count_key]
+        else:
+            key = (self.endpoint, search, tuple(tuple(f) for f in filters or ()))
+            count = list_count_cache.get(key, count_query.scalar)
+
+        for join in self._auto_joins:
+            query = query.options(joinedload(join))
+
+        if page_size is None:
+            page_size = self.page_size
+        query = apply_keyset(query, self.model, cursor, page_size)
+
+        if not execute:
+            return count, query
+
+        data = query.all()
+        args = request.args.to_dict()
+        args.pop('page', None)
+        args.pop('after', None)
+        self._template_args['keyset'] = True
+        self._template_args['first_page_url'] = url_for('.index_view', **args) if cursor else None
+        self._template_args['next_page_url'] = None
+        if page_size and len(data) == page_size:
+            last = data[-1]
+            self._template_args['next_page_url'] = url_for(
+                '.index_view', after=encode_cursor(last.created_on, last.id), **args)
+        return count, data
+
+# ================================================
+# FULL-TEXT SEARCH (SQLite FTS5)
+# ================================================
+
+# create_all builds the FTS tables and triggers with their base tables;
+# existing databases get them from the b7f3d2a9c5e1 migration
+for _index in search.INDEXES:
+    for _statement in _index.ddl():
+        event.listen(db.Model.metadata.tables[_index.table], 'after_create',
+                     DDL(_statement).execute_if(dialect='sqlite'))
+
+SEARCH_RESULT_FIELDS = {
+    'project': ('id', 'name', 'status', 'client_name'),
+    'scanner_model': ('id', 'name', 'manufacturer'),
+}
+
+def search_ids(index, text):
+    """SELECT of the base-table ids matching `text`, or None when it has no words"""
+    match = search.match_query(text)
+    if match is None:
+        return None
+    return db.select(db.literal_column('rowid')) \
+        .select_from(db.table(index.fts_table)) \
+        .where(db.text(f'{index.fts_table} MATCH :match').bindparams(match=match))
+
+def full_text_search(index, text, limit):
+    """Best matches first (bm25 over the weighted columns), with a highlighted snippet"""
+    match = search.match_query(text)
+    if match is None:
+        return []
+    fts = index.fts_table
+    fields = ', '.join(f'{index.table}.{name}' for name in SEARCH_RESULT_FIELDS[index.table])
+    rows = db.session.execute(db.text(
+        f"SELECT {fields}, -{index.rank_sql()} AS score, "
+        f"snippet({fts}, -1, '[', ']', '…', 12) AS snippet "
+        f"FROM {fts} JOIN {index.table} ON {index.table}.id = {fts}.rowid "
+        f"WHERE {fts} MATCH :match ORDER BY score DESC LIMIT :limit"
+    ), {'match': match, 'limit': limit})
+    return [dict(row._mapping) for row in rows]
+
+class FullTextSearchMixin:
+    """Answers the admin search box from `search_index` instead of ILIKE '%term%'"""
+    search_index = None
+
+    def _apply_search(self, query, count_query, joins, count_joins, search_text):
+        if db.engine.dialect.name != 'sqlite':
+            return super()._apply_search(query, count_query, joins, count_joins, search_text)
+        ids = search_ids(self.search_index, search_text)
+        if ids is not None:
+            query = query.filter(self.model.id.in_(ids))
+            count_query = count_query.filter(self.model.id.in_(ids))
+        return query, count_query, joins, count_joins
+
+# ================================================
+# PROJECT SUMMARY (trigger-maintained rollups)
+# ================================================
+
+# The triggers span several tables, so create_all adds them once the whole
+# schema exists; existing databases get them from the 7c4e9b2d1f60 migration
+for _statement in project_summary.ddl():
+    event.listen(db.Model.metadata, 'after_create',
+                 DDL(_statement).execute_if(dialect='sqlite'))
+
+def rebuild_project_summaries():
+    """Recompute every project_summary row from the base tables"""
+    db.session.execute(db.text(project_summary.refresh_sql()))
+    db.session.commit()
+
+@bp.cli.command('rebuild-summaries')
+def rebuild_summaries_command():
+    """Recompute the per-project rollups from sites and conformity reports."""
+    started = time.perf_counter()
+    rebuild_project_summaries()
+    click.echo(f'Rebuilt project summaries in {time.perf_counter() - started:.1f}s')
+
 # ================================================
 # CUSTOM ADMIN DASHBOARD
 # ================================================
@@ -116,263 +650,105 @@ class ConformityReport(db.Model):
 class CTScannerAdminIndexView(AdminIndexView):
     @expose('/')
     def index(self):
-        # Get counts for dashboard
-        project_count = Project.query.count()
-        scanner_count = ScannerModel.query.count()
-        site_count = SiteSpecification.query.count()
-        report_count = ConformityReport.query.count()
+        stats = dashboard_stats.get()
         
-        # Recent activity
-        recent_projects = Project.query.order_by(Project.created_on.desc()).limit(5).all()
-        
-        # Custom dashboard template
-        dashboard_template = '''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>CT Scanner Preinstallation Manager</title>
-            <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-            <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-            <style>
-                .sidebar { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }
-                .card { border: none; box-shadow: 0 4px 6px rgba(0,0,0,0.1); transition: transform 0.2s; }
-                .card:hover { transform: translateY(-2px); }
-                .stat-card { border-left: 4px solid; }
-                .stat-card.projects { border-left-color: #007bff; }
-                .stat-card.scanners { border-left-color: #28a745; }
-                .stat-card.sites { border-left-color: #17a2b8; }
-                .stat-card.reports { border-left-color: #ffc107; }
-            </style>
-        </head>
-        <body class="bg-light">
-            <div class="container-fluid">
-                <div class="row">
-                    <!-- Sidebar -->
-                    <div class="col-md-2 sidebar text-white min-vh-100 p-0">
-                        <div class="p-3">
-                            <h4><i class="fas fa-hospital"></i> CT Scanner</h4>
-                            <small>Preinstallation Manager</small>
-                        </div>
-                        <ul class="nav nav-pills flex-column px-3">
-                            <li class="nav-item mb-2">
-                                <a class="nav-link text-white-50" href="{{ url_for('admin.index') }}">
-                                    <i class="fas fa-tachometer-alt"></i> Dashboard
-                                </a>
-                            </li>
-                            <li class="nav-item mb-2">
-                                <a class="nav-link text-white" href="{{ url_for('project.index_view') }}">
-                                    <i class="fas fa-folder"></i> Projects
-                                </a>
-                            </li>
-                            <li class="nav-item mb-2">
-                                <a class="nav-link text-white" href="{{ url_for('scannermodel.index_view') }}">
-                                    <i class="fas fa-cogs"></i> Scanner Models
-                                </a>
-                            </li>
-                            <li class="nav-item mb-2">
-                                <a class="nav-link text-white" href="{{ url_for('sitespecification.index_view') }}">
-                                    <i class="fas fa-building"></i> Site Specifications
-                                </a>
-                            </li>
-                            <li class="nav-item mb-2">
-                                <a class="nav-link text-white" href="{{ url_for('conformityreport.index_view') }}">
-                                    <i class="fas fa-clipboard-check"></i> Conformity Reports
-                                </a>
-                            </li>
-                        </ul>
-                    </div>
-                    
-                    <!-- Main Content -->
-                    <div class="col-md-10">
-                        <div class="p-4">
-                            <!-- Header -->
-                            <div class="d-flex justify-content-between align-items-center mb-4">
-                                <div>
-                                    <h1 class="h3 mb-0">🎯 Dashboard</h1>
-                                    <p class="text-muted">CT Scanner Preinstallation Management System</p>
-                                </div>
-                                <div>
-                                    <span class="badge bg-success">Step 2 Complete</span>
-                                    <span class="badge bg-info">Ready for Step 3</span>
-                                </div>
-                            </div>
-                            
-                            <!-- Stats Cards -->
-                            <div class="row mb-4">
-                                <div class="col-md-3">
-                                    <div class="card stat-card projects">
-                                        <div class="card-body text-center">
-                                            <i class="fas fa-folder fa-2x text-primary mb-2"></i>
-                                            <h3 class="mb-0">{{ project_count }}</h3>
-                                            <p class="text-muted mb-0">Projects</p>
-                                            <a href="{{ url_for('project.index_view') }}" class="btn btn-sm btn-primary mt-2">Manage</a>
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="col-md-3">
-                                    <div class="card stat-card scanners">
-                                        <div class="card-body text-center">
-                                            <i class="fas fa-cogs fa-2x text-success mb-2"></i>
-                                            <h3 class="mb-0">{{ scanner_count }}</h3>
-                                            <p class="text-muted mb-0">Scanner Models</p>
-                                            <a href="{{ url_for('scannermodel.index_view') }}" class="btn btn-sm btn-success mt-2">View</a>
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="col-md-3">
-                                    <div class="card stat-card sites">
-                                        <div class="card-body text-center">
-                                            <i class="fas fa-building fa-2x text-info mb-2"></i>
-                                            <h3 class="mb-0">{{ site_count }}</h3>
-                                            <p class="text-muted mb-0">Site Specs</p>
-                                            <a href="{{ url_for('sitespecification.index_view') }}" class="btn btn-sm btn-info mt-2">Manage</a>
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="col-md-3">
-                                    <div class="card stat-card reports">
-                                        <div class="card-body text-center">
-                                            <i class="fas fa-clipboard-check fa-2x text-warning mb-2"></i>
-                                            <h3 class="mb-0">{{ report_count }}</h3>
-                                            <p class="text-muted mb-0">Reports</p>
-                                            <a href="{{ url_for('conformityreport.index_view') }}" class="btn btn-sm btn-warning mt-2">View</a>
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                            
-                            <!-- Quick Actions -->
-                            <div class="row mb-4">
-                                <div class="col-md-8">
-                                    <div class="card">
-                                        <div class="card-header">
-                                            <h5 class="mb-0"><i class="fas fa-rocket"></i> Quick Actions</h5>
-                                        </div>
-                                        <div class="card-body">
-                                            <div class="row">
-                                                <div class="col-md-6">
-                                                    <a href="/create-sample-data" class="btn btn-warning w-100 mb-2">
-                                                        <i class="fas fa-download"></i> Load Sample Scanners
-                                                    </a>
-                                                    <a href="{{ url_for('project.create_view') }}" class="btn btn-primary w-100 mb-2">
-                                                        <i class="fas fa-plus"></i> New Project
-                                                    </a>
-                                                </div>
-                                                <div class="col-md-6">
-                                                    <a href="/test" class="btn btn-secondary w-100 mb-2">
-                                                        <i class="fas fa-flask"></i> System Test
-                                                    </a>
-                                                    <a href="/debug-routes" class="btn btn-info w-100 mb-2">
-                                                        <i class="fas fa-route"></i> Debug Routes
-                                                    </a>
-                                                </div>
-                                            </div>
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="col-md-4">
-                                    <div class="card">
-                                        <div class="card-header">
-                                            <h5 class="mb-0"><i class="fas fa-info-circle"></i> System Status</h5>
-                                        </div>
-                                        <div class="card-body">
-                                            <div class="d-flex justify-content-between">
-                                                <span>Database:</span>
-                                                <span class="badge bg-success">Connected</span>
-                                            </div>
-                                            <div class="d-flex justify-content-between">
-                                                <span>OpenAI API:</span>
-                                                <span class="badge bg-success">Configured</span>
-                                            </div>
-                                            <div class="d-flex justify-content-between">
-                                                <span>Admin Interface:</span>
-                                                <span class="badge bg-success">Active</span>
-                                            </div>
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                            
-                            <!-- Recent Projects -->
-                            {% if recent_projects %}
-                            <div class="card">
-                                <div class="card-header">
-                                    <h5 class="mb-0"><i class="fas fa-clock"></i> Recent Projects</h5>
-                                </div>
-                                <div class="card-body">
-                                    <div class="table-responsive">
-                                        <table class="table table-sm">
-                                            <thead>
-                                                <tr>
-                                                    <th>Name</th>
-                                                    <th>Status</th>
-                                                    <th>Client</th>
-                                                    <th>Created</th>
-                                                    <th>Actions</th>
-                                                </tr>
-                                            </thead>
-                                            <tbody>
-                                                {% for project in recent_projects %}
-                                                <tr>
-                                                    <td>{{ project.name }}</td>
-                                                    <td><span class="badge bg-info">{{ project.status }}</span></td>
-                                                    <td>{{ project.client_name or 'N/A' }}</td>
-                                                    <td>{{ project.created_on.strftime('%Y-%m-%d') if project.created_on else 'N/A' }}</td>
-                                                    <td>
-                                                        <a href="{{ url_for('project.edit_view', id=project.id) }}" class="btn btn-sm btn-outline-primary">Edit</a>
-                                                    </td>
-                                                </tr>
-                                                {% endfor %}
-                                            </tbody>
-                                        </table>
-                                    </div>
-                                </div>
-                            </div>
-                            {% endif %}
-                            
-                            <!-- Features Status -->
-                            <div class="mt-4">
-                                <h5>📋 Features Status</h5>
-                                <ul class="list-unstyled">
-                                    <li><i class="fas fa-check text-success"></i> Project Management</li>
-                                    <li><i class="fas fa-check text-success"></i> Scanner Model Database (NeuViz ACE/ACE SP)</li>
-                                    <li><i class="fas fa-check text-success"></i> Site Specification Management</li>
-                                    <li><i class="fas fa-check text-success"></i> Admin Interface with Dashboard</li>
-                                    <li><i class="fas fa-clock text-warning"></i> AI Conformity Analysis (Step 3)</li>
-                                    <li><i class="fas fa-clock text-warning"></i> Scanner Comparison Tool (Step 3)</li>
-                                </ul>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        '''
-        
-        return render_template_string(dashboard_template,
-                                    project_count=project_count,
-                                    scanner_count=scanner_count,
-                                    site_count=site_count,
-                                    report_count=report_count,
-                                    recent_projects=recent_projects)
+        return render_template('dashboard.html', **stats)
 
 # ================================================
 # ADMIN VIEWS (Enhanced)
 # ================================================
 
-class ProjectView(ModelView):
-    column_list = ['name', 'status', 'client_name', 'engineer_name', 'created_on']
-    column_searchable_list = ['name', 'client_name', 'engineer_name']
+class EagerLoadingModelView(ModelView):
+    """ModelView that applies `list_query_options` to its list and export queries"""
+    list_query_options = ()
+
+    def get_query(self):
+        return super().get_query().options(*self.list_query_options)
+
+class StreamingExportMixin:
+    """
+    Exports by iterating the list query in `yield_per` batches instead of
+    loading every row. Goes before KeysetPaginationMixin in the bases, so
+    the export's list query reaches it first.
+    """
+    export_types = ['csv', 'xlsx']
+    export_batch_size = 1000
+
+    def get_list(self, page, sort_column, sort_desc, search, filters,
+                 execute=True, page_size=None):
+        # Flask-Admin's _export_data (kept for its checks) asks for the rows
+        # as a list; on export requests hand it the query, streamed
+        if execute and request.endpoint == f'{self.endpoint}.export':
+            count, query = super().get_list(page, sort_column, sort_desc, search, filters,
+                                            execute=False, page_size=page_size)
+            return count, query.yield_per(self.export_batch_size)
+        return super().get_list(page, sort_column, sort_desc, search, filters,
+                                execute=execute, page_size=page_size)
+
+    @expose('/export/<export_type>/')
+    def export(self, export_type):
+        if export_type == 'xlsx' and self.can_export and export_type in self.export_types:
+            return self._export_xlsx()
+        return super().export(export_type)
+
+    def _export_xlsx(self):
+        _, data = self._export_data()
+
+        from openpyxl import Workbook
+
+        # Write-only mode keeps one row in memory; the sheet is spooled to a
+        # temporary file and sent back in chunks
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet(title=self.name[:31])
+        sheet.append([title for _, title in self._export_columns])
+        for row in data:
+            sheet.append([_xlsx_cell(self.get_export_value(row, name))
+                          for name, _ in self._export_columns])
+
+        spool = tempfile.TemporaryFile()
+        workbook.save(spool)
+        spool.seek(0)
+        return send_file(
+            spool,
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            as_attachment=True,
+            download_name=self.get_export_name(export_type='xlsx'),
+        )
+
+def _xlsx_cell(value):
+    if value is None or isinstance(value, (str, int, float, datetime)):
+        return value
+    return str(value)
+
+class ProjectView(FullTextSearchMixin, StreamingExportMixin, KeysetPaginationMixin,
+                  EagerLoadingModelView):
+    column_list = ['name', 'status', 'client_name', 'engineer_name', 'summary.site_count',
+                   'summary.best_score', 'summary.pass_count', 'summary.fail_count',
+                   'summary.total_estimated_cost', 'created_on']
+    column_sortable_list = ['name', 'status', 'client_name', 'engineer_name', 'summary.site_count',
+                            'summary.best_score', 'summary.pass_count', 'summary.fail_count',
+                            'summary.total_estimated_cost', 'created_on']
+    column_labels = {
+        'summary.site_count': 'Sites',
+        'summary.best_score': 'Best Score',
+        'summary.pass_count': 'Passed',
+        'summary.fail_count': 'Failed',
+        'summary.total_estimated_cost': 'Estimated Cost',
+    }
+    list_query_options = (joinedload(Project.summary),)
+    column_searchable_list = ['name', 'client_name', 'engineer_name', 'description']
+    search_index = search.PROJECT_INDEX
     column_filters = ['status', 'created_on']
     form_columns = ['name', 'description', 'status', 'client_name', 'engineer_name']
     can_export = True
-    column_default_sort = ('created_on', True)
+    keyset_count_key = 'project_count'
 
-class ScannerModelView(ModelView):
+class ScannerModelView(FullTextSearchMixin, StreamingExportMixin, ModelView):
     column_list = ['name', 'manufacturer', 'weight', 'min_room_length', 'min_room_width', 'power_requirement']
-    column_searchable_list = ['name', 'manufacturer']
+    column_searchable_list = ['name', 'manufacturer', 'special_requirements']
+    search_index = search.SCANNER_INDEX
     column_filters = ['manufacturer']
+    form_excluded_columns = ['power_voltage', 'power_kva', 'power_phase']
     can_export = True
     
     # Custom formatting for NeuViz models
@@ -380,94 +756,148 @@ class ScannerModelView(ModelView):
         columns = super().scaffold_list_columns()
         return columns
 
-class SiteSpecificationView(ModelView):
+class SiteSpecificationView(StreamingExportMixin, EagerLoadingModelView):
+    list_template = 'admin/model/site_specification_list.html'
     column_list = ['project', 'room_length', 'room_width', 'room_height', 'floor_capacity', 'created_on']
     column_filters = ['project', 'created_on']
+    form_excluded_columns = ['supply_voltage', 'supply_kva', 'supply_phase']
     can_export = True
     column_default_sort = ('created_on', True)
+    list_query_options = (joinedload(SiteSpecification.project),)
+
+    @expose('/import/', methods=('GET', 'POST'))
+    def import_view(self):
+        if request.method == 'POST':
+            upload = request.files.get('file')
+            if not upload or not upload.filename:
+                flash('Choose an .xlsx or .csv file to import.', 'error')
+            else:
+                job = enqueue_site_import(upload)
+                flash(f'Import queued as job {job.id}.', 'info')
+                return redirect(self.get_url('.import_view', job=job.id))
+
+        job = None
+        if request.args.get('job', type=int):
+            job = Job.query.get(request.args.get('job', type=int))
+        if job is not None and job.status == 'done':
+            result = job.result
+            flash(f"Imported {result['imported']} sites, {result['failed']} rows rejected.",
+                  'success' if not result['failed'] else 'warning')
+        elif job is not None and job.status == 'failed':
+            flash(f'Import failed: {job.error}', 'error')
+        return self.render('admin/site_import.html', job=job,
+                           max_errors=IMPORT_MAX_ERRORS)
 
-class ConformityReportView(ModelView):
+    def after_model_change(self, form, model, is_created):
+        if is_created:
+            names = [record.name for record in scanner_catalog.fitting(site_values(model.id))]
+            if names:
+                flash(f'Scanner models that fit this room: {", ".join(names)}', 'info')
+            else:
+                flash('No scanner model in the catalog fits this room.', 'warning')
+
+    @action('evaluate_conformity', 'Evaluate Conformity',
+            'Score the selected sites against every scanner model?')
+    def action_evaluate_conformity(self, ids):
+        try:
+            job = enqueue_job('evaluate_conformity', {'site_ids': [int(pk) for pk in ids]},
+                              priority=JOB_PRIORITY_INTERACTIVE)
+            flash(f'Conformity evaluation of {len(ids)} sites queued as job {job.id}.', 'info')
+        except Exception as ex:
+            if not self.handle_view_exception(ex):
+                raise
+            flash(f'Failed to queue the conformity evaluation: {ex}', 'error')
+
+class ConformityReportView(StreamingExportMixin, KeysetPaginationMixin, EagerLoadingModelView):
     column_list = ['site_spec', 'scanner_model', 'conformity_score', 'pass_fail', 'critical_issues', 'created_on']
     column_filters = ['pass_fail', 'created_on', 'scanner_model']
+    form_excluded_columns = ['input_fingerprint', 'stale']
     can_export = True
-    column_default_sort = ('created_on', True)
+    keyset_count_key = 'report_count'
+    # SiteSpecification.__repr__ reads project.name for every row
+    list_query_options = (
+        joinedload(ConformityReport.site_spec).joinedload(SiteSpecification.project),
+        joinedload(ConformityReport.scanner_model),
+    )
+
+class JobView(ModelView):
+    can_create = False
+    can_edit = False
+    can_view_details = True
+    column_list = ['id', 'kind', 'status', 'priority', 'attempts', 'worker',
+                   'created_on', 'finished_on', 'error']
+    column_filters = ['kind', 'status']
+    column_default_sort = ('id', True)
 
 # ================================================
 # INITIALIZE ADMIN
 # ================================================
 
-admin = Admin(
-    app, 
-    name='CT Scanner Manager', 
-    index_view=CTScannerAdminIndexView()
-)
+def init_admin(app):
+    """Attach a fresh Admin with the model views to `app`"""
+    admin = Admin(
+        app,
+        name='CT Scanner Manager',
+        index_view=CTScannerAdminIndexView()
+    )
 
-# Add views with proper endpoints
-admin.add_view(ProjectView(Project, db.session, name='Projects', endpoint='project'))
-admin.add_view(ScannerModelView(ScannerModel, db.session, name='Scanner Models', endpoint='scannermodel'))
-admin.add_view(SiteSpecificationView(SiteSpecification, db.session, name='Site Specifications', endpoint='sitespecification'))
-admin.add_view(ConformityReportView(ConformityReport, db.session, name='Conformity Reports', endpoint='conformityreport'))
+    # Add views with proper endpoints
+    admin.add_view(ProjectView(Project, db.session, name='Projects', endpoint='project'))
+    admin.add_view(ScannerModelView(ScannerModel, db.session, name='Scanner Models', endpoint='scannermodel'))
+    admin.add_view(SiteSpecificationView(SiteSpecification, db.session, name='Site Specifications', endpoint='sitespecification'))
+    admin.add_view(ConformityReportView(ConformityReport, db.session, name='Conformity Reports', endpoint='conformityreport'))
+    admin.add_view(JobView(Job, db.session, name='Jobs', endpoint='job'))
+    return admin
 
 # ================================================
 # SAMPLE DATA CREATION (Enhanced)
 # ================================================
 
+def upsert_scanner_catalog(update_existing=True):
+    """
+    Insert the seed_data.SCANNER_CATALOG models that are missing, matched on
+    (manufacturer, name), and reset changed ones to the canonical values
+    unless `update_existing` is False. Returns (inserted, updated).
+    """
+    fields = ('id',) + tuple(seed_data.SCANNER_CATALOG[0]) + conformity.POWER_SCANNER_FIELDS
+    existing = {(row.manufacturer, row.name): row._asdict() for row in
+                db.session.query(*[getattr(ScannerModel, name) for name in fields])}
+
+    inserts, updates = [], []
+    for values in seed_data.scanner_mappings():
+        current = existing.get((values['manufacturer'], values['name']))
+        if current is None:
+            inserts.append(values)
+        elif update_existing and any(current[name] != value for name, value in values.items()):
+            updates.append(dict(values, id=current['id']))
+
+    if inserts or updates:
+        if inserts:
+            db.session.execute(ScannerModel.__table__.insert(), inserts)
+        if updates:
+            db.session.bulk_update_mappings(ScannerModel, updates)
+        # Neither statement goes through a flush, so mark the catalog and the
+        # reports scored from reset scanners by hand
+        bump_catalog_version(db.session.connection())
+        db.session.info['scanner_catalog_dirty'] = True
+        rescored = [values['id'] for values in updates
+                    if any(existing[(values['manufacturer'], values['name'])][name] != values[name]
+                           for name in conformity.SCANNER_FIELDS)]
+        for chunk in _chunks(rescored):
+            ConformityReport.query.filter(ConformityReport.scanner_model_id.in_(chunk),
+                                          ConformityReport.stale == db.false()) \
+                .update({'stale': True}, synchronize_session=False)
+        if rescored:
+            db.session.info['conformity_stale'] = True
+        db.session.commit()
+        invalidate_cached_counts()
+    return len(inserts), len(updates)
+
 def create_sample_data():
     """Create comprehensive sample data"""
     try:
-        # Create scanners if they don't exist
-        if ScannerModel.query.count() == 0:
-            scanners = [
-                ScannerModel(
-                    name='NeuViz ACE',
-                    manufacturer='Neusoft Medical Systems',
-                    weight=1400,
-                    min_room_length=6.5,
-                    min_room_width=4.2,
-                    min_room_height=2.43,
-                    min_door_width=1.2,
-                    power_requirement='380V 50kVA',
-                    special_requirements='Neusoft engineer required, Enhanced grounding, Temperature ±4.1°C/h, NPS-CT-0651 compliance'
-                ),
-                ScannerModel(
-                    name='NeuViz ACE SP',
-                    manufacturer='Neusoft Medical Systems',
-                    weight=1450,
-                    min_room_length=6.8,
-                    min_room_width=4.5,
-                    min_room_height=2.43,
-                    min_door_width=1.2,
-                    power_requirement='380V 55kVA',
-                    special_requirements='Neusoft engineer required, Enhanced grounding, Temperature ±4.1°C/h, NPS-CT-0651 compliance'
-                ),
-                ScannerModel(
-                    name='GE Revolution CT',
-                    manufacturer='GE HealthCare',
-                    weight=1850,
-                    min_room_length=7.0,
-                    min_room_width=4.8,
-                    min_room_height=2.5,
-                    min_door_width=1.3,
-                    power_requirement='400V 80kVA',
-                    special_requirements='Water cooling required, Advanced shielding, Revolution platform'
-                ),
-                ScannerModel(
-                    name='Siemens SOMATOM',
-                    manufacturer='Siemens Healthineers',
-                    weight=1750,
-                    min_room_length=6.8,
-                    min_room_width=4.5,
-                    min_room_height=2.4,
-                    min_door_width=1.25,
-                    power_requirement='480V 75kVA',
-                    special_requirements='Seismic isolation recommended, EMC testing required, Quantum technology'
-                )
-            ]
-            
-            for scanner in scanners:
-                db.session.add(scanner)
-            
-            db.session.commit()
+        inserted, _ = upsert_scanner_catalog(update_existing=False)
+        if inserted:
             print("✅ Sample scanner models created")
             return True
             
@@ -476,56 +906,1156 @@ def create_sample_data():
         print(f"⚠️ Error creating sample data: {e}")
         return False
 
+def seed_database(projects, sites, reports=None, seed=0, batch_size=500, progress=None):
+    """
+    Generate `projects` projects holding `sites` sites between them, plus
+    conformity reports for the first `reports` (site, scanner) pairs (all
+    of them by default), using Core executemany inserts and one transaction
+    per batch of projects. Projects already present by name are skipped, so
+    re-running with the same arguments only fills in what is missing.
+    Raises ValueError when `reports` exceeds the number of such pairs.
+    """
+    upsert_scanner_catalog()
+    catalog = scanner_catalog.get()
+    scanner_count = len(catalog.records)
+    scanner_fps = conformity.row_fingerprints(catalog.matrix, len(conformity.SCANNER_FIELDS))
+    if reports is None:
+        reports = sites * scanner_count
+    elif reports > sites * scanner_count:
+        raise ValueError(f'{reports} reports need at least {-(-reports // scanner_count)} sites: '
+                         f'each site gets one report per scanner model ({scanner_count})')
+    batch_size = max(1, min(batch_size, SQLITE_MAX_VARIABLES))
+    stats = {'projects': 0, 'sites': 0, 'reports': 0, 'skipped': 0}
+
+    for start in range(0, projects, batch_size):
+        indexes = range(start, min(start + batch_size, projects))
+        names = [seed_data.project_name(i) for i in indexes]
+        existing = {name for name, in db.session.query(Project.name).filter(Project.name.in_(names))}
+        todo = [i for i, name in zip(indexes, names) if name not in existing]
+        stats['skipped'] += len(indexes) - len(todo)
+        if not todo:
+            if progress:
+                progress(len(indexes))
+            continue
+
+        generated = [(i,) + seed_data.generate_project(seed, i, seed_data.sites_for_project(i, projects, sites))
+                     for i in todo]
+        db.session.execute(Project.__table__.insert(), [project for _, project, _ in generated])
+        project_ids = dict(db.session.query(Project.name, Project.id)
+                           .filter(Project.name.in_([project['name'] for _, project, _ in generated])))
+
+        site_rows, positions = [], []
+        for i, project, project_sites in generated:
+            first = seed_data.first_site_index(i, projects, sites)
+            for k, site in enumerate(project_sites):
+                site['project_id'] = project_ids[project['name']]
+                site_rows.append(site)
+                positions.append(first + k)
+
+        report_rows = []
+        if site_rows:
+            db.session.execute(SiteSpecification.__table__.insert(), site_rows)
+            # Single writer: ids come back in insertion order
+            site_ids = [pk for pk, in db.session.query(SiteSpecification.id)
+                        .filter(SiteSpecification.project_id.in_(list(project_ids.values())))
+                        .order_by(SiteSpecification.id)]
+            site_inputs = [[site[name] for name in conformity.SITE_FIELDS] for site in site_rows]
+            result = conformity.score_matrix(site_inputs, catalog.matrix)
+            site_fps = conformity.row_fingerprints(site_inputs, len(conformity.SITE_FIELDS))
+            scores = result.conformity_score.tolist()
+            passed = result.pass_fail.tolist()
+            issues = result.critical_issues.tolist()
+            for row, (site_id, position) in enumerate(zip(site_ids, positions)):
+                for j, record in enumerate(catalog.records):
+                    if position * scanner_count + j >= reports:
+                        break
+                    report_rows.append({
+                        'site_spec_id': site_id,
+                        'scanner_model_id': record.id,
+                        'conformity_score': scores[row][j],
+                        'pass_fail': passed[row][j],
+                        'critical_issues': issues[row][j],
+                        'input_fingerprint': site_fps[row] + scanner_fps[j],
+                    })
+            if report_rows:
+                db.session.execute(ConformityReport.__table__.insert(), report_rows)
+
+        db.session.commit()
+        stats['projects'] += len(generated)
+        stats['sites'] += len(site_rows)
+        stats['reports'] += len(report_rows)
+        if progress:
+            progress(len(indexes))
+
+    invalidate_cached_counts()
+    return stats
+
+@bp.cli.command('seed')
+@click.option('--projects', default=100, show_default=True)
+@click.option('--sites', default=1000, show_default=True, help='Total across all projects.')
+@click.option('--reports', type=int, default=None,
+              help='Total conformity reports, at most one per site and scanner model; '
+                   'defaults to every site against every scanner.')
+@click.option('--seed', 'seed', default=0, show_default=True, help='RNG seed.')
+@click.option('--batch-size', default=500, show_default=True, help='Projects per transaction.')
+def seed_command(projects, sites, reports, seed, batch_size):
+    """Upsert the scanner catalog and generate projects, sites and reports."""
+    started = time.perf_counter()
+    with click.progressbar(length=projects, label='Seeding projects') as bar:
+        try:
+            stats = seed_database(projects, sites, reports, seed, batch_size, progress=bar.update)
+        except ValueError as ex:
+            raise click.BadParameter(str(ex), param_hint='--reports')
+    click.echo(f"Inserted {stats['projects']} projects, {stats['sites']} sites, "
+               f"{stats['reports']} reports ({stats['skipped']} projects already present) "
+               f"in {time.perf_counter() - started:.1f}s")
+
+# ================================================
+# CONFORMITY ENGINE
+# ================================================
+
+SQLITE_MAX_VARIABLES = 900
+
+def _chunks(values, size=SQLITE_MAX_VARIABLES):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def _site_rows_query():
+    site_columns = [getattr(SiteSpecification, name) for name in conformity.SITE_FIELDS]
+    return db.session.query(SiteSpecification.id, *site_columns).order_by(SiteSpecification.id)
+
+def _site_rows(site_ids=None):
+    """(id, *SITE_FIELDS) rows ordered by id, for all sites or `site_ids`"""
+    site_rows = []
+    if site_ids is None:
+        site_rows = _site_rows_query().all()
+    else:
+        for chunk in _chunks(list(site_ids)):
+            site_rows.extend(_site_rows_query().filter(SiteSpecification.id.in_(chunk)).all())
+        site_rows.sort(key=lambda row: row[0])
+    return site_rows
+
+def evaluate_conformity(site_ids=None, scanner_ids=None):
+    """
+    Score sites against scanners; returns (site_ids, scanner_ids,
+    ConformityMatrix, (site fingerprints, scanner fingerprints))
+    """
+    site_rows = _site_rows(site_ids)
+
+    catalog = scanner_catalog.get()
+    if scanner_ids is None:
+        positions = range(len(catalog.records))
+    else:
+        wanted = set(scanner_ids)
+        positions = [i for i, record in enumerate(catalog.records) if record.id in wanted]
+
+    sites = [row[1:] for row in site_rows]
+    scanners = catalog.matrix[list(positions)]
+    result = conformity.score_matrix(sites, scanners)
+    fingerprints = (conformity.row_fingerprints(sites, len(conformity.SITE_FIELDS)),
+                    conformity.row_fingerprints(scanners, len(conformity.SCANNER_FIELDS)))
+    return ([row[0] for row in site_rows], [catalog.records[i].id for i in positions],
+            result, fingerprints)
+
+def write_conformity_reports(site_ids=None, scanner_ids=None):
+    """Evaluate and bulk-write ConformityReport rows, updating existing pairs in place"""
+    site_ids, scanner_ids, result, (site_fps, scanner_fps) = \
+        evaluate_conformity(site_ids, scanner_ids)
+    if not site_ids or not scanner_ids:
+        return 0
+    metrics.CONFORMITY_PAIRS.inc(len(site_ids) * len(scanner_ids))
+
+    existing = {}
+    for chunk in _chunks(site_ids):
+        rows = db.session.query(ConformityReport.id,
+                                ConformityReport.site_spec_id,
+                                ConformityReport.scanner_model_id,
+                                ConformityReport.conformity_score,
+                                ConformityReport.pass_fail,
+                                ConformityReport.critical_issues) \
+            .filter(ConformityReport.site_spec_id.in_(chunk)).all()
+        for report_id, site_id, scanner_id, *scored in rows:
+            existing[(site_id, scanner_id)] = (report_id, tuple(scored))
+
+    scores = result.conformity_score.tolist()
+    passed = result.pass_fail.tolist()
+    issues = result.critical_issues.tolist()
+
+    inserts, updates = [], []
+    for i, site_id in enumerate(site_ids):
+        for j, scanner_id in enumerate(scanner_ids):
+            values = {
+                'conformity_score': scores[i][j],
+                'pass_fail': passed[i][j],
+                'critical_issues': issues[i][j],
+                'input_fingerprint': site_fps[i] + scanner_fps[j],
+                'stale': False,
+            }
+            current = existing.get((site_id, scanner_id))
+            if current is None:
+                values.update(site_spec_id=site_id, scanner_model_id=scanner_id)
+                inserts.append(values)
+            else:
+                report_id, scored = current
+                values['id'] = report_id
+                # New scores invalidate the AI text written for the old ones,
+                # as in refresh_stale_reports; it is requeued
+                if scored != (scores[i][j], passed[i][j], issues[i][j]):
+                    values['ai_evaluation_text'] = None
+                updates.append(values)
+
+    try:
+        db.session.bulk_insert_mappings(ConformityReport, inserts)
+        db.session.bulk_update_mappings(ConformityReport, updates)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    # Bulk inserts bypass the mapper events
+    if inserts:
+        invalidate_cached_counts()
+    return len(inserts) + len(updates)
+
+# ================================================
+# INCREMENTAL RE-EVALUATION
+# ================================================
+
+def _mark_reports_stale(report_column, fields):
+    """after_update listener flagging the reports scored from the target row"""
+    def listener(mapper, connection, target):
+        state = db.inspect(target)
+        if not any(state.attrs[name].history.has_changes() for name in fields):
+            return
+        table = ConformityReport.__table__
+        connection.execute(table.update()
+                           .where(report_column == target.id)
+                           .where(table.c.stale == db.false())
+                           .values(stale=True))
+        session = object_session(target)
+        if session is not None:
+            session.info['conformity_stale'] = True
+    return listener
+
+event.listen(SiteSpecification, 'after_update', _mark_reports_stale(
+    ConformityReport.__table__.c.site_spec_id, conformity.SITE_FIELDS))
+event.listen(ScannerModel, 'after_update', _mark_reports_stale(
+    ConformityReport.__table__.c.scanner_model_id, conformity.SCANNER_FIELDS))
+
+def refresh_stale_reports(batch_size=SQLITE_MAX_VARIABLES):
+    """
+    Rescore the reports flagged stale, a batch per transaction. Reports
+    whose inputs are back to the fingerprinted values keep their results;
+    the others get new scores and lose their AI evaluation, which is
+    requeued. Returns the number of reports rescored.
+    """
+    refreshed = 0
+    while True:
+        ids = [pk for pk, in db.session.query(ConformityReport.id)
+               .filter(ConformityReport.stale == db.true()).limit(batch_size)]
+        if not ids:
+            return refreshed
+        try:
+            # Claiming the batch takes SQLite's write lock, so the inputs read
+            # below cannot change again before it commits
+            ConformityReport.query.filter(ConformityReport.id.in_(ids)) \
+                .update({'stale': False}, synchronize_session=False)
+            reports = db.session.query(ConformityReport.id, ConformityReport.site_spec_id,
+                                       ConformityReport.scanner_model_id,
+                                       ConformityReport.input_fingerprint) \
+                .filter(ConformityReport.id.in_(ids)).all()
+            scanner_catalog.invalidate()  # another worker may have edited a scanner
+            site_ids, scanner_ids, result, (site_fps, scanner_fps) = evaluate_conformity(
+                {report.site_spec_id for report in reports},
+                {report.scanner_model_id for report in reports})
+            site_index = {pk: i for i, pk in enumerate(site_ids)}
+            scanner_index = {pk: j for j, pk in enumerate(scanner_ids)}
+
+            updates = []
+            for report_id, site_id, scanner_id, fingerprint in reports:
+                i, j = site_index.get(site_id), scanner_index.get(scanner_id)
+                if i is None or j is None or site_fps[i] + scanner_fps[j] == fingerprint:
+                    continue
+                updates.append({
+                    'id': report_id,
+                    'conformity_score': float(result.conformity_score[i, j]),
+                    'pass_fail': bool(result.pass_fail[i, j]),
+                    'critical_issues': int(result.critical_issues[i, j]),
+                    'input_fingerprint': site_fps[i] + scanner_fps[j],
+                    'ai_evaluation_text': None,
+                })
+            db.session.bulk_update_mappings(ConformityReport, updates)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        metrics.CONFORMITY_PAIRS.inc(len(updates))
+        refreshed += len(updates)
+
+def mark_changed_reports(batch_size=10000):
+    """
+    Flag every report whose stored fingerprint no longer matches its site
+    and scanner, e.g. after bulk writes that skip the ORM hooks. Reports
+    scored before fingerprints existed are flagged too. Returns the count.
+    """
+    site_rows = _site_rows()
+    site_fps = dict(zip((row[0] for row in site_rows), conformity.row_fingerprints(
+        [row[1:] for row in site_rows], len(conformity.SITE_FIELDS))))
+    scanner_catalog.invalidate()
+    catalog = scanner_catalog.get()
+    scanner_fps = dict(zip((record.id for record in catalog.records), conformity.row_fingerprints(
+        catalog.matrix, len(conformity.SCANNER_FIELDS))))
+
+    changed = []
+    reports = db.session.query(ConformityReport.id, ConformityReport.site_spec_id,
+                               ConformityReport.scanner_model_id,
+                               ConformityReport.input_fingerprint) \
+        .filter(ConformityReport.stale == db.false()).yield_per(batch_size)
+    for report_id, site_id, scanner_id, fingerprint in reports:
+        if site_id in site_fps and scanner_id in scanner_fps and \
+                site_fps[site_id] + scanner_fps[scanner_id] != fingerprint:
+            changed.append(report_id)
+
+    for chunk in _chunks(changed):
+        ConformityReport.query.filter(ConformityReport.id.in_(chunk)) \
+            .update({'stale': True}, synchronize_session=False)
+    db.session.commit()
+    return len(changed)
+
+class ConformityRefresher:
+    """
+    Daemon thread that runs refresh_stale_reports whenever a commit has
+    flagged reports, so an edit reaches its reports within milliseconds.
+    Started on first use, so it never exists in a preloading master.
+    """
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._app = None
+
+    def wake(self, app):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._app = app
+                self._thread = threading.Thread(target=self._run, name='conformity-refresher',
+                                                daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._app.app_context():
+                try:
+                    refresh_stale_reports()
+                except Exception:
+                    self._app.logger.exception('Rescoring stale conformity reports failed')
+                finally:
+                    db.session.remove()
+
+conformity_refresher = app_state('conformity_refresher')
+
+@event.listens_for(db.session, 'after_commit')
+def _refresh_stale_reports_on_commit(session):
+    if session.info.pop('conformity_stale', False) and has_app_context() \
+            and current_app.config['CONFORMITY_AUTO_REFRESH']:
+        conformity_refresher.wake(current_app._get_current_object())
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_stale_reports(session):
+    session.info.pop('conformity_stale', None)
+
+@bp.cli.command('reevaluate')
+@click.option('--verify', is_flag=True,
+              help='First compare every report with its inputs and flag the changed ones.')
+def reevaluate_command(verify):
+    """Rescore conformity reports whose site or scanner changed."""
+    if verify:
+        click.echo(f'{mark_changed_reports()} reports flagged stale')
+    click.echo(f'Rescored {refresh_stale_reports()} reports')
+
+# ================================================
+# FLEET EVALUATION (process pool)
+# ================================================
+
+def _projects_missing_reports(scanner_count):
+    """(project_id, site_count) of projects with fewer reports than site x scanner pairs"""
+    sites = db.session.query(SiteSpecification.project_id, db.func.count(SiteSpecification.id)) \
+        .group_by(SiteSpecification.project_id).order_by(SiteSpecification.project_id).all()
+    reports = dict(db.session.query(SiteSpecification.project_id, db.func.count(ConformityReport.id))
+                   .join(ConformityReport, ConformityReport.site_spec_id == SiteSpecification.id)
+                   .group_by(SiteSpecification.project_id).all())
+    return [(project_id, count) for project_id, count in sites
+            if reports.get(project_id, 0) < count * scanner_count]
+
+def _partition_projects(projects, partition_sites):
+    """Group whole projects into lists holding about `partition_sites` sites"""
+    partition, size = [], 0
+    for project_id, count in projects:
+        partition.append(project_id)
+        size += count
+        if size >= partition_sites:
+            yield partition
+            partition, size = [], 0
+    if partition:
+        yield partition
+
+def evaluate_fleet(workers=None, partition_sites=5000, commit_rows=100000, progress=None):
+    """
+    Write the missing ConformityReport rows for every site against the full
+    catalog. The parent reads one partition of projects at a time and hands
+    it to a process pool for scoring; results come back to this single
+    writer, which inserts them with Core executemany and commits after at
+    least `commit_rows` rows, always at a partition boundary. A project is
+    therefore fully written or not at all, and a rerun after an interruption
+    only picks up the projects still missing reports.
+    """
+    catalog = scanner_catalog.get()
+    scanner_ids = [record.id for record in catalog.records]
+    stats = {'projects': 0, 'sites': 0, 'reports': 0}
+    if not scanner_ids:
+        return stats
+    scanners = catalog.matrix
+    scanner_fps = conformity.row_fingerprints(scanners, len(conformity.SCANNER_FIELDS))
+    partitions = iter(list(_partition_projects(
+        _projects_missing_reports(len(scanner_ids)), partition_sites)))
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = collections.deque()
+
+        def submit_next():
+            project_ids = next(partitions, None)
+            if project_ids is None:
+                return
+            site_rows = []
+            for chunk in _chunks(project_ids):
+                site_rows.extend(_site_rows_query().filter(SiteSpecification.project_id.in_(chunk)))
+            site_ids = [row[0] for row in site_rows]
+            future = pool.submit(conformity.score_partition, [row[1:] for row in site_rows], scanners)
+            in_flight.append((len(project_ids), site_ids, future))
+
+        # Keep every worker busy while the writer inserts
+        for _ in range(workers * 2):
+            submit_next()
+
+        uncommitted = 0
+        try:
+            while in_flight:
+                project_count, site_ids, future = in_flight.popleft()
+                scores, passed, issues, site_fps = future.result()
+                submit_next()
+
+                existing = set()
+                for chunk in _chunks(site_ids):
+                    existing.update(db.session.query(ConformityReport.site_spec_id,
+                                                     ConformityReport.scanner_model_id)
+                                    .filter(ConformityReport.site_spec_id.in_(chunk)))
+                scores, passed, issues = scores.tolist(), passed.tolist(), issues.tolist()
+                rows = [{
+                    'site_spec_id': site_id,
+                    'scanner_model_id': scanner_id,
+                    'conformity_score': scores[i][j],
+                    'pass_fail': passed[i][j],
+                    'critical_issues': issues[i][j],
+                    'input_fingerprint': site_fps[i] + scanner_fps[j],
+                } for i, site_id in enumerate(site_ids)
+                    for j, scanner_id in enumerate(scanner_ids)
+                    if (site_id, scanner_id) not in existing]
+                if rows:
+                    db.session.execute(ConformityReport.__table__.insert(), rows)
+                uncommitted += len(rows)
+                if uncommitted >= commit_rows:
+                    db.session.commit()
+                    uncommitted = 0
+
+                stats['projects'] += project_count
+                stats['sites'] += len(site_ids)
+                stats['reports'] += len(rows)
+                metrics.CONFORMITY_PAIRS.inc(len(site_ids) * len(scanner_ids))
+                if progress:
+                    progress(len(site_ids))
+            db.session.commit()
+        except BaseException:
+            # Ctrl-C included: keep the committed partitions, drop the rest
+            db.session.rollback()
+            for _, _, future in in_flight:
+                future.cancel()
+            raise
+        finally:
+            invalidate_cached_counts()
+    return stats
+
+@bp.cli.command('evaluate-fleet')
+@click.option('--workers', type=int, default=None, help='Scoring processes; defaults to every core.')
+@click.option('--partition-size', default=5000, show_default=True,
+              help='Sites per task; projects are never split.')
+@click.option('--commit-rows', default=100000, show_default=True,
+              help='Reports written per transaction, at least.')
+def evaluate_fleet_command(workers, partition_size, commit_rows):
+    """Score every site of every project against the whole scanner catalog."""
+    started = time.perf_counter()
+    total = sum(count for _, count in _projects_missing_reports(len(scanner_catalog.get().records)))
+    with click.progressbar(length=total, label='Evaluating sites') as bar:
+        stats = evaluate_fleet(workers, partition_size, commit_rows, progress=bar.update)
+    click.echo(f"Wrote {stats['reports']} reports for {stats['sites']} sites in "
+               f"{stats['projects']} projects in {time.perf_counter() - started:.1f}s")
+
+# ================================================
+# ELECTRICAL SUPPLY BACKFILL
+# ================================================
+
+def backfill_power_specs(batch_size=1000):
+    """Re-parse every power string into its numeric columns; returns rows updated"""
+    targets = (
+        (ScannerModel, 'power_requirement', conformity.POWER_SCANNER_FIELDS),
+        (SiteSpecification, 'electrical_power', conformity.POWER_SITE_FIELDS),
+    )
+    updated = 0
+    for model, source, fields in targets:
+        rows = db.session.query(model.id, getattr(model, source)) \
+            .order_by(model.id).yield_per(batch_size)
+        batch = []
+        for pk, text in rows:
+            batch.append(dict(zip(fields, power_spec.parse_power(text)), id=pk))
+            if len(batch) >= batch_size:
+                db.session.bulk_update_mappings(model, batch)
+                updated += len(batch)
+                batch = []
+        if batch:
+            db.session.bulk_update_mappings(model, batch)
+            updated += len(batch)
+    db.session.commit()
+    return updated
+
+@bp.cli.command('backfill-power')
+@click.option('--batch-size', default=1000, show_default=True)
+def backfill_power_command(batch_size):
+    """Parse power_requirement / electrical_power into numeric columns."""
+    click.echo(f'Parsed {backfill_power_specs(batch_size)} rows')
+    # bulk_update_mappings skips the after_update hooks
+    click.echo(f'{mark_changed_reports()} conformity reports flagged stale; '
+               f'run `reevaluate` to rescore them')
+
+# ================================================
+# SITE SPECIFICATION IMPORT
+# ================================================
+
+IMPORT_MAX_ERRORS = 1000
+
+def _resolve_projects(rows, known):
+    """Replace `project` names with ids, looking up only names and ids not seen yet"""
+    names = {values['project'] for _, values in rows if 'project' in values} - set(known['names'])
+    ids = {values['project_id'] for _, values in rows if 'project_id' in values} - set(known['ids'])
+    for chunk in _chunks(list(names)):
+        known['names'].update(db.session.query(Project.name, Project.id)
+                              .filter(Project.name.in_(chunk)).all())
+    for chunk in _chunks(list(ids)):
+        known['ids'].update((pk, True) for pk, in
+                            db.session.query(Project.id).filter(Project.id.in_(chunk)))
+    known['names'].update((name, None) for name in names if name not in known['names'])
+    known['ids'].update((pk, False) for pk in ids if pk not in known['ids'])
+
+def import_site_specifications(stream, filename, batch_size=1000):
+    """
+    Stream spreadsheet rows into site_specification, one transaction per
+    batch. Invalid rows are skipped and reported; returns {'imported',
+    'failed', 'errors'} with at most IMPORT_MAX_ERRORS (row, message) pairs.
+    """
+    result = {'imported': 0, 'failed': 0, 'errors': []}
+    known = {'names': {}, 'ids': {}}
+
+    def reject(row_number, message):
+        result['failed'] += 1
+        if len(result['errors']) < IMPORT_MAX_ERRORS:
+            result['errors'].append((row_number, message))
+
+    import site_import
+
+    rows = site_import.read_rows(stream, filename)
+    for batch in site_import.batches(rows, batch_size):
+        valid = []
+        for row_number, row in batch:
+            try:
+                valid.append((row_number, site_import.validate_row(row)))
+            except ValueError as ex:
+                reject(row_number, str(ex))
+
+        _resolve_projects(valid, known)
+        mappings = []
+        for row_number, values in valid:
+            if 'project' in values:
+                name = values.pop('project')
+                values['project_id'] = known['names'][name]
+                if values['project_id'] is None:
+                    reject(row_number, f'unknown project {name!r}')
+                    continue
+            elif not known['ids'][values['project_id']]:
+                reject(row_number, f"unknown project_id {values['project_id']}")
+                continue
+            mappings.append((row_number, values))
+
+        try:
+            db.session.bulk_insert_mappings(SiteSpecification, [values for _, values in mappings])
+            db.session.commit()
+            result['imported'] += len(mappings)
+        except SQLAlchemyError:
+            db.session.rollback()
+            # Find the offending rows one by one so the rest of the batch lands
+            for row_number, values in mappings:
+                try:
+                    db.session.bulk_insert_mappings(SiteSpecification, [values])
+                    db.session.commit()
+                    result['imported'] += 1
+                except SQLAlchemyError as ex:
+                    db.session.rollback()
+                    reject(row_number, str(ex.orig if hasattr(ex, 'orig') else ex))
+
+    if result['imported']:
+        invalidate_cached_counts()
+    result['errors'].sort()
+    return result
+
+@bp.cli.command('import-sites')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', default=1000, show_default=True)
+def import_sites_command(path, batch_size):
+    """Import site specifications from an .xlsx or .csv file."""
+    import site_import
+
+    started = time.perf_counter()
+    with open(path, 'rb') as stream:
+        try:
+            result = import_site_specifications(stream, path, batch_size)
+        except site_import.ImportFormatError as ex:
+            raise click.ClickException(str(ex))
+    for row_number, message in result['errors']:
+        click.echo(f'row {row_number}: {message}', err=True)
+    if result['failed'] > len(result['errors']):
+        click.echo(f"... {result['failed'] - len(result['errors'])} more errors", err=True)
+    click.echo(f"Imported {result['imported']} sites, {result['failed']} rows rejected "
+               f"in {time.perf_counter() - started:.1f}s")
+
+# ================================================
+# SCANNER FIT LOOKUP
+# ================================================
+
+def _at_most(column, value):
+    # A requirement the scanner leaves empty (or zero) is always met; an
+    # unknown site value meets no stated requirement. Each branch is an
+    # index lookup or range, so SQLite can seek instead of scanning.
+    return db.or_(column.is_(None), column <= (0 if value is None else max(value, 0)))
+
+def fitting_scanners_query(site):
+    """
+    Scanners that fit `site`, a dict of conformity.SITE_FIELDS values, as a
+    single range query answered from ix_scanner_model_fit. Applies the same
+    rules as conformity.score_matrix. Rows are unordered: ORDER BY id would
+    make SQLite prefer a rowid scan over the index seek.
+    """
+    query = db.session.query(ScannerModel.id, ScannerModel.name, ScannerModel.manufacturer)
+    door_height = site.get('door_height')
+    if door_height is None or door_height < conformity.DEFAULT_MIN_DOOR_HEIGHT:
+        return query.filter(db.false())
+
+    floor_capacity = site.get('floor_capacity')
+    criteria = [
+        _at_most(ScannerModel.min_room_length, site.get('room_length')),
+        _at_most(ScannerModel.min_room_width, site.get('room_width')),
+        _at_most(ScannerModel.min_room_height, site.get('room_height')),
+        _at_most(ScannerModel.min_door_width, site.get('door_width')),
+        _at_most(ScannerModel.weight, None if floor_capacity is None
+                 else floor_capacity * conformity.DEFAULT_FOOTPRINT_AREA),
+    ]
+    # Electrical checks are skipped for sites that do not state a supply
+    if site.get('supply_kva') is not None:
+        criteria.append(_at_most(ScannerModel.power_kva, site['supply_kva']))
+    if site.get('supply_phase') is not None:
+        criteria.append(_at_most(ScannerModel.power_phase, site['supply_phase']))
+    voltage = site.get('supply_voltage')
+    if voltage is not None:
+        tolerance = conformity.VOLTAGE_TOLERANCE
+        criteria.append(db.or_(
+            ScannerModel.power_voltage.is_(None),
+            ScannerModel.power_voltage <= 0,
+            ScannerModel.power_voltage.between(voltage / (1 + tolerance), voltage / (1 - tolerance)),
+        ))
+    return query.filter(*criteria)
+
+def site_values(site_spec_id):
+    """conformity.SITE_FIELDS of a stored site as a dict, or None if it does not exist"""
+    row = db.session.query(*[getattr(SiteSpecification, name) for name in conformity.SITE_FIELDS]) \
+        .filter(SiteSpecification.id == site_spec_id).first()
+    return row._asdict() if row is not None else None
+
+# ================================================
+# AI EVALUATION QUEUE
+# ================================================
+
+AI_SITE_FIELDS = conformity.DIMENSION_SITE_FIELDS + ('electrical_power', 'hvac_system')
+AI_SCANNER_FIELDS = ('name', 'manufacturer') + conformity.DIMENSION_SCANNER_FIELDS + \
+    ('power_requirement', 'special_requirements')
+AI_ASSESSMENT_FIELDS = ('conformity_score', 'pass_fail', 'critical_issues')
+
+def pending_ai_jobs(limit=None):
+    """Reports without ai_evaluation_text, as plain dicts for the async client"""
+    columns = [ConformityReport.id] + \
+        [getattr(SiteSpecification, name) for name in AI_SITE_FIELDS] + \
+        [getattr(ScannerModel, name) for name in AI_SCANNER_FIELDS] + \
+        [getattr(ConformityReport, name) for name in AI_ASSESSMENT_FIELDS]
+    query = db.session.query(*columns) \
+        .join(SiteSpecification, ConformityReport.site_spec_id == SiteSpecification.id) \
+        .join(ScannerModel, ConformityReport.scanner_model_id == ScannerModel.id) \
+        .filter(ConformityReport.ai_evaluation_text.is_(None)) \
+        .order_by(ConformityReport.id)
+    if limit:
+        query = query.limit(limit)
+
+    site_end = 1 + len(AI_SITE_FIELDS)
+    scanner_end = site_end + len(AI_SCANNER_FIELDS)
+    return [{
+        'id': row[0],
+        'site': dict(zip(AI_SITE_FIELDS, row[1:site_end])),
+        'scanner': dict(zip(AI_SCANNER_FIELDS, row[site_end:scanner_end])),
+        'assessment': dict(zip(AI_ASSESSMENT_FIELDS, row[scanner_end:])),
+    } for row in query]
+
+class EvaluationCache:
+    """Persistent content-addressed store of AI evaluations with LRU eviction"""
+
+    def __init__(self, max_entries, max_bytes):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(self, keys):
+        """Return {key: text} for cached keys and mark them recently used"""
+        found = {}
+        for chunk in _chunks(list(keys)):
+            found.update(db.session.query(AIEvaluationCache.key, AIEvaluationCache.evaluation_text)
+                         .filter(AIEvaluationCache.key.in_(chunk)).all())
+        if found:
+            now = datetime.utcnow()
+            for chunk in _chunks(list(found)):
+                AIEvaluationCache.query.filter(AIEvaluationCache.key.in_(chunk)).update(
+                    {'last_used_on': now, 'hits': AIEvaluationCache.hits + 1},
+                    synchronize_session=False)
+            db.session.commit()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        metrics.cache_lookup('ai_evaluation', True, len(found))
+        metrics.cache_lookup('ai_evaluation', False, len(keys) - len(found))
+        return found
+
+    def add(self, entries, model):
+        """Stage {key: text} entries in the current transaction; existing keys are kept"""
+        if not entries:
+            return
+        import ai_evaluation
+
+        now = datetime.utcnow()
+        db.session.execute(
+            sqlite_insert(AIEvaluationCache.__table__).on_conflict_do_nothing(index_elements=['key']),
+            [{
+                'key': key,
+                'prompt_version': ai_evaluation.PROMPT_VERSION,
+                'model': model,
+                'evaluation_text': text,
+                'size': len(text.encode('utf-8')),
+                'hits': 0,
+                'created_on': now,
+                'last_used_on': now,
+            } for key, text in entries.items()],
+        )
+
+    def evict(self):
+        """Delete least recently used entries until both limits hold"""
+        count, size = db.session.query(db.func.count(AIEvaluationCache.key),
+                                       db.func.coalesce(db.func.sum(AIEvaluationCache.size), 0)).one()
+        if count <= self.max_entries and size <= self.max_bytes:
+            return 0
+
+        victims = []
+        oldest = db.session.query(AIEvaluationCache.key, AIEvaluationCache.size) \
+            .order_by(AIEvaluationCache.last_used_on).yield_per(1000)
+        for key, entry_size in oldest:
+            if count <= self.max_entries and size <= self.max_bytes:
+                break
+            victims.append(key)
+            count -= 1
+            size -= entry_size
+        for chunk in _chunks(victims):
+            AIEvaluationCache.query.filter(AIEvaluationCache.key.in_(chunk)) \
+                .delete(synchronize_session=False)
+        db.session.commit()
+        self.evictions += len(victims)
+        return len(victims)
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+evaluation_cache = app_state('evaluation_cache')
+
+def _write_ai_results(results, cache_entries=None, model=None):
+    try:
+        db.session.bulk_update_mappings(ConformityReport, results)
+        if cache_entries:
+            evaluation_cache.add(cache_entries, model)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+def run_ai_evaluations(limit=None):
+    """
+    Evaluate pending reports with the configured API. Reports whose prompt
+    is already cached, or shared by another pending report, reuse that
+    evaluation instead of calling the API again.
+    """
+    import ai_evaluation
+
+    if not current_app.config.get('OPENAI_API_KEY'):
+        raise RuntimeError('OPENAI_API_KEY is not configured')
+
+    model = current_app.config['OPENAI_MODEL']
+    jobs_by_key = {}
+    for job in pending_ai_jobs(limit):
+        jobs_by_key.setdefault(ai_evaluation.cache_key(job, model), []).append(job)
+    stats = {'evaluated': 0, 'cached': 0, 'failed': 0}
+    if not jobs_by_key:
+        return stats
+
+    cached = evaluation_cache.lookup(list(jobs_by_key))
+    if cached:
+        hits = [{'id': job['id'], 'ai_evaluation_text': text}
+                for key, text in cached.items()
+                for job in jobs_by_key.pop(key)]
+        _write_ai_results(hits)
+        stats['cached'] = len(hits)
+
+    # One request per distinct prompt; results fan out to every report sharing it
+    key_by_job_id = {jobs[0]['id']: key for key, jobs in jobs_by_key.items()}
+
+    def write_batch(results):
+        mappings, entries = [], {}
+        for result in results:
+            key = key_by_job_id[result['id']]
+            entries[key] = result['ai_evaluation_text']
+            mappings.extend({'id': job['id'], 'ai_evaluation_text': result['ai_evaluation_text']}
+                            for job in jobs_by_key[key])
+        _write_ai_results(mappings, entries, model)
+        stats['evaluated'] += len(mappings)
+
+    if jobs_by_key:
+        client = ai_evaluation.EvaluationClient(
+            api_key=current_app.config['OPENAI_API_KEY'],
+            base_url=current_app.config['OPENAI_BASE_URL'],
+            model=model,
+            concurrency=current_app.config['AI_EVALUATION_CONCURRENCY'],
+            max_retries=current_app.config['AI_EVALUATION_MAX_RETRIES'],
+        )
+        unique_jobs = [jobs[0] for jobs in jobs_by_key.values()]
+        asyncio.run(client.run(unique_jobs, write_batch,
+                               batch_size=current_app.config['AI_EVALUATION_BATCH_SIZE']))
+        stats['failed'] = sum(len(jobs) for jobs in jobs_by_key.values()) - stats['evaluated']
+        evaluation_cache.evict()
+    for source, key in (('api', 'evaluated'), ('cache', 'cached'), ('failed', 'failed')):
+        metrics.AI_EVALUATIONS.labels(source).inc(stats[key])
+    return stats
+
+@bp.cli.command('evaluate-ai')
+@click.option('--limit', type=int, default=None, help='Evaluate at most this many reports per pass.')
+@click.option('--interval', type=float, default=None,
+              help='Keep polling for pending reports every N seconds.')
+def evaluate_ai_command(limit, interval):
+    """Fill ai_evaluation_text for pending conformity reports."""
+    while True:
+        try:
+            stats = run_ai_evaluations(limit)
+        except RuntimeError as ex:
+            raise click.ClickException(str(ex))
+        cache = evaluation_cache.stats()
+        click.echo(f"Evaluated {stats['evaluated']} reports, {stats['cached']} from cache, "
+                   f"{stats['failed']} failed (cache hits {cache['hits']}, misses {cache['misses']}, "
+                   f"evictions {cache['evictions']})")
+        if interval is None:
+            break
+        time.sleep(interval)
+
+# ================================================
+# JOB QUEUE
+# ================================================
+
+# Jobs started from the UI run ahead of bulk and scheduled work
+JOB_PRIORITY_INTERACTIVE = 10
+
+JOB_HANDLERS = {}
+
+class JobFailed(Exception):
+    """Raised by a job handler for a failure that retrying will not fix"""
+
+class ClaimedJob(NamedTuple):
+    id: int
+    kind: str
+    payload: dict
+    attempts: int
+    max_attempts: int
+    lease_token: str
+
+def job_handler(kind):
+    """Register `func(payload)` as the runner of `kind` jobs; it returns the JSON result"""
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+def enqueue_job(kind, payload=None, priority=0, max_attempts=3):
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f'unknown job kind {kind!r}')
+    job = Job(kind=kind, payload=payload or {}, priority=priority, max_attempts=max_attempts)
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+def expire_job_leases():
+    """Requeue running jobs whose worker stopped heartbeating, or fail them when out of attempts"""
+    now = datetime.utcnow()
+    expired = Job.query.filter(Job.status == 'running', Job.lease_expires < now)
+    released = {'lease_token': None, 'lease_expires': None, 'error': 'lease expired'}
+    expired.filter(Job.attempts >= Job.max_attempts) \
+        .update(dict(released, status='failed', finished_on=now), synchronize_session=False)
+    expired.update(dict(released, status='queued'), synchronize_session=False)
+    db.session.commit()
+
+def claim_job(worker, lease_seconds):
+    """
+    Lease the next runnable job to `worker`, or return None. A single
+    UPDATE both picks the row and marks it running (SQLite runs it under
+    the database write lock), so two workers never get the same job; the
+    row is then read back by the new lease token.
+    """
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+    next_job = db.select(Job.id) \
+        .where(Job.status == 'queued', Job.run_after <= now) \
+        .order_by(Job.priority.desc(), Job.id).limit(1) \
+        .correlate(None).scalar_subquery()
+    try:
+        claimed = Job.query.filter(Job.id == next_job).update({
+            'status': 'running',
+            'attempts': Job.attempts + 1,
+            'lease_token': token,
+            'lease_expires': now + timedelta(seconds=lease_seconds),
+            'heartbeat_on': now,
+            'started_on': now,
+            'worker': worker,
+        }, synchronize_session=False)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    if not claimed:
+        return None
+    row = db.session.query(Job.id, Job.kind, Job.payload, Job.attempts, Job.max_attempts) \
+        .filter(Job.lease_token == token).one()
+    db.session.commit()
+    return ClaimedJob(*row, lease_token=token)
+
+def renew_job_leases(tokens, lease_seconds):
+    """Heartbeat: extend the leases of the jobs this worker is running"""
+    now = datetime.utcnow()
+    for chunk in _chunks(list(tokens)):
+        Job.query.filter(Job.lease_token.in_(chunk)).update(
+            {'heartbeat_on': now, 'lease_expires': now + timedelta(seconds=lease_seconds)},
+            synchronize_session=False)
+    db.session.commit()
+
+def run_job(job):
+    """Run a claimed job and record its outcome; failures are retried with backoff"""
+    now = datetime.utcnow
+    try:
+        result = JOB_HANDLERS[job.kind](job.payload or {})
+    except Exception as ex:
+        db.session.rollback()
+        current_app.logger.exception('Job %s (%s) attempt %d failed', job.id, job.kind, job.attempts)
+        values = {'error': f'{type(ex).__name__}: {ex}'}
+        if isinstance(ex, JobFailed) or job.kind not in JOB_HANDLERS or \
+                job.attempts >= job.max_attempts:
+            values.update(status='failed', finished_on=now())
+        else:
+            delay = current_app.config['JOB_RETRY_DELAY'] * 2 ** (job.attempts - 1)
+            values.update(status='queued', run_after=now() + timedelta(seconds=delay))
+    else:
+        values = {'status': 'done', 'result': result, 'error': None, 'finished_on': now()}
+
+    values.update(lease_token=None, lease_expires=None)
+    # A job whose lease ran out may already belong to another worker
+    recorded = Job.query.filter(Job.id == job.id, Job.lease_token == job.lease_token) \
+        .update(values, synchronize_session=False)
+    db.session.commit()
+    if not recorded:
+        current_app.logger.warning('Job %s finished after its lease expired', job.id)
+    return values['status']
+
+def run_worker(app, threads, poll_interval, burst=False, stop=None):
+    """
+    Claim jobs and run them on a pool of `threads` until `stop` is set, or
+    with `burst` until the queue is empty. Only this loop claims; a
+    heartbeat thread renews the leases of the jobs in progress and requeues
+    the jobs of workers that died.
+    """
+    stop = stop or threading.Event()
+    lease_seconds = app.config['JOB_LEASE_SECONDS']
+    name = f'{socket.gethostname()}:{os.getpid()}'
+    slots = threading.BoundedSemaphore(threads)
+    running = {}  # lease token -> job id
+    lock = threading.Lock()
+    finished = threading.Event()
+
+    def execute(job):
+        with app.app_context():
+            try:
+                run_job(job)
+            except Exception:
+                app.logger.exception('Recording the outcome of job %s failed', job.id)
+            finally:
+                db.session.remove()
+                with lock:
+                    running.pop(job.lease_token, None)
+                slots.release()
+
+    def heartbeat():
+        with app.app_context():
+            while not finished.wait(lease_seconds / 3):
+                with lock:
+                    tokens = list(running)
+                try:
+                    if tokens:
+                        renew_job_leases(tokens, lease_seconds)
+                    expire_job_leases()
+                except SQLAlchemyError:
+                    db.session.rollback()
+                    app.logger.exception('Job heartbeat failed')
+            db.session.remove()
+
+    threading.Thread(target=heartbeat, name='job-heartbeat', daemon=True).start()
+    try:
+        with app.app_context(), ThreadPoolExecutor(threads, thread_name_prefix='job') as pool:
+            while not stop.is_set():
+                if not slots.acquire(timeout=poll_interval):
+                    continue
+                try:
+                    job = claim_job(name, lease_seconds)
+                except SQLAlchemyError:
+                    app.logger.exception('Claiming a job failed')
+                    job = None
+                if job is None:
+                    slots.release()
+                    with lock:
+                        idle = not running
+                    if burst and idle:
+                        break
+                    stop.wait(poll_interval)
+                    continue
+                with lock:
+                    running[job.lease_token] = job.id
+                pool.submit(execute, job)
+            # Leaving the pool waits for the jobs in progress
+    finally:
+        finished.set()
+
+@bp.cli.command('worker')
+@click.option('--threads', type=int, default=None,
+              help='Jobs run at once; defaults to WORKER_THREADS.')
+@click.option('--poll-interval', type=float, default=None,
+              help='Seconds between polls of an empty queue; defaults to JOB_POLL_INTERVAL.')
+@click.option('--burst', is_flag=True, help='Exit once the queue is empty.')
+def worker_command(threads, poll_interval, burst):
+    """Run queued jobs; start more processes to run more at once."""
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        click.echo('Stopping after the jobs in progress (Ctrl-C again to abort)...')
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    app = current_app._get_current_object()
+    run_worker(app, threads or app.config['WORKER_THREADS'],
+               poll_interval or app.config['JOB_POLL_INTERVAL'], burst, stop)
+
+def enqueue_site_import(upload, batch_size=1000):
+    """Save an uploaded sheet where the workers can read it and queue its import"""
+    directory = current_app.config['JOB_FILES_DIR']
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, uuid.uuid4().hex + os.path.splitext(upload.filename)[1])
+    upload.save(path)
+    # Batches commit as they go, so a retry would import the first ones twice
+    return enqueue_job('import_sites',
+                       {'path': path, 'filename': upload.filename, 'batch_size': batch_size},
+                       priority=JOB_PRIORITY_INTERACTIVE, max_attempts=1)
+
+@job_handler('import_sites')
+def _import_sites_job(payload):
+    import site_import
+
+    try:
+        with open(payload['path'], 'rb') as stream:
+            result = import_site_specifications(stream, payload['filename'], payload['batch_size'])
+    except site_import.ImportFormatError as ex:
+        raise JobFailed(str(ex)) from ex
+    finally:
+        if os.path.exists(payload['path']):
+            os.remove(payload['path'])
+    result['errors'] = [{'row': row, 'message': message} for row, message in result['errors']]
+    return result
+
+@job_handler('evaluate_conformity')
+def _evaluate_conformity_job(payload):
+    return {'reports': write_conformity_reports(site_ids=payload.get('site_ids'),
+                                                scanner_ids=payload.get('scanner_ids'))}
+
+@job_handler('evaluate_ai')
+def _evaluate_ai_job(payload):
+    try:
+        return run_ai_evaluations(payload.get('limit'))
+    except RuntimeError as ex:  # not configured
+        raise JobFailed(str(ex)) from ex
+
+def queued_job_count():
+    return db.session.query(db.func.count(Job.id)).filter(Job.status == 'queued').scalar()
+
+# ================================================
+# METRICS
+# ================================================
+
+def pending_ai_count():
+    return db.session.query(db.func.count(ConformityReport.id)) \
+        .filter(ConformityReport.ai_evaluation_text.is_(None)).scalar()
+
 # ================================================
 # ROUTES (Enhanced)
 # ================================================
 
-@app.route('/')
+@bp.route('/')
 def index():
     return redirect(url_for('admin.index'))
 
-@app.route('/test')
+@bp.route('/test')
 def test():
     """Enhanced system test"""
     try:
-        project_count = Project.query.count()
-        scanner_count = ScannerModel.query.count()
-        site_count = SiteSpecification.query.count()
-        report_count = ConformityReport.query.count()
-        
-        return f'''
-        <h2>🧪 Enhanced System Test</h2>
-        <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 20px;">
-            <h3>Database Status</h3>
-            <p>✅ Database: Connected and working</p>
-            <p>✅ Projects: {project_count} in database</p>
-            <p>✅ Scanner Models: {scanner_count} loaded</p>
-            <p>✅ Site Specifications: {site_count} records</p>
-            <p>✅ Conformity Reports: {report_count} reports</p>
-            
-            <h3>Configuration</h3>
-            <p>✅ OpenAI API: {"Configured" if app.config.get("OPENAI_API_KEY") else "Not configured"}</p>
-            <p>✅ Flask-Admin: Working properly</p>
-            <p>✅ Database Models: All models loaded</p>
-            
-            <h3>Quick Links</h3>
-            <p><a href="/admin/" style="color: #007bff;">🔧 Admin Dashboard</a></p>
-            <p><a href="/admin/scannermodel/" style="color: #28a745;">⚙️ Scanner Models</a></p>
-            <p><a href="/admin/project/" style="color: #17a2b8;">📁 Projects</a></p>
-            <p><a href="/create-sample-data" style="color: #ffc107;">📊 Load Sample Data</a></p>
-            
-            <h3>Next Steps</h3>
-            <p>🎯 <strong>Step 2 Complete!</strong> Ready for Step 3: AI Integration</p>
-        </div>
-        '''
+        stats = dashboard_stats.get()
+        return render_template('system_test.html', **stats)
     except Exception as e:
-        return f'''
-        <h2>❌ System Test Failed</h2>
-        <p>Error: {str(e)}</p>
-        <p><a href="/">Back to Home</a></p>
-        '''
+        return render_template('system_test.html', error=str(e))
 
-@app.route('/create-sample-data')
+@bp.route('/create-sample-data')
 def create_sample_data_route():
     """Create sample data route"""
     success = create_sample_data()
@@ -537,33 +2067,155 @@ def create_sample_data_route():
         message = "ℹ️ Sample data already exists or failed to create."
         details = "Check the scanner models in the admin interface."
         
-    return f'''
-    <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 20px;">
-        <h2>{message}</h2>
-        <p>{details}</p>
-        
-        <h3>Scanner Models Added:</h3>
-        <ul>
-            <li>NeuViz ACE (Neusoft Medical Systems)</li>
-            <li>NeuViz ACE SP (Neusoft Medical Systems)</li>
-            <li>GE Revolution CT (GE HealthCare)</li>
-            <li>Siemens SOMATOM (Siemens Healthineers)</li>
-        </ul>
-        
-        <h3>Quick Links:</h3>
-        <p><a href="/admin/">🏠 Admin Dashboard</a></p>
-        <p><a href="/admin/scannermodel/">⚙️ View Scanner Models</a></p>
-        <p><a href="/test">🧪 System Test</a></p>
-    </div>
-    '''
-
-@app.route('/debug-routes')
+    return render_template('sample_data.html', message=message, details=details)
+
+API_PAGE_SIZE = 100
+API_MAX_PAGE_SIZE = 1000
+
+PROJECT_API_FIELDS = ('id', 'name', 'status', 'client_name', 'engineer_name', 'created_on')
+REPORT_API_FIELDS = ('id', 'site_spec_id', 'scanner_model_id', 'conformity_score',
+                     'pass_fail', 'critical_issues', 'estimated_cost', 'created_on')
+
+def _keyset_json(model, fields, filters, count_key):
+    """JSON page of `model` rows after the `after` cursor"""
+    limit = min(request.args.get('limit', API_PAGE_SIZE, type=int), API_MAX_PAGE_SIZE)
+    if limit <= 0:
+        abort(400)
+    after = request.args.get('after')
+    cursor = decode_cursor(after)
+    if after and cursor is None:
+        abort(400)
+
+    query = db.session.query(*[getattr(model, name) for name in fields])
+    for name, value in filters.items():
+        query = query.filter(getattr(model, name) == value)
+
+    if filters:
+        key = (model.__tablename__, tuple(sorted(filters.items())))
+        total = list_count_cache.get(
+            key, db.session.query(db.func.count(model.id)).filter_by(**filters).scalar)
+    else:
+        total = dashboard_stats.get()[count_key]
+
+    rows = apply_keyset(query, model, cursor, limit).all()
+    items = []
+    for row in rows:
+        item = row._asdict()
+        item['created_on'] = item['created_on'].isoformat() if item['created_on'] else None
+        items.append(item)
+
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = encode_cursor(rows[-1].created_on, rows[-1].id)
+    return jsonify(items=items, next_cursor=next_cursor, total=total)
+
+@bp.route('/api/projects')
+def api_projects():
+    """Keyset-paginated project listing"""
+    filters = {}
+    if request.args.get('status'):
+        filters['status'] = request.args['status']
+    return _keyset_json(Project, PROJECT_API_FIELDS, filters, 'project_count')
+
+@bp.route('/api/conformity-reports')
+def api_conformity_reports():
+    """Keyset-paginated conformity report listing"""
+    filters = {}
+    for name in ('site_spec_id', 'scanner_model_id'):
+        value = request.args.get(name, type=int)
+        if value is not None:
+            filters[name] = value
+    return _keyset_json(ConformityReport, REPORT_API_FIELDS, filters, 'report_count')
+
+SEARCH_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+@bp.route('/api/search')
+def api_search():
+    """
+    Ranked prefix search over projects (name, client, engineer, description)
+    and scanner models (name, manufacturer, special requirements).
+    ?type=project or ?type=scanner_model restricts it to one of them.
+    """
+    text = request.args.get('q', '')
+    limit = min(request.args.get('limit', SEARCH_LIMIT, type=int), SEARCH_MAX_LIMIT)
+    kind = request.args.get('type')
+    if limit <= 0 or kind not in (None, 'project', 'scanner_model'):
+        abort(400)
+    results = {}
+    for index in search.INDEXES:
+        if kind in (None, index.table):
+            results[index.table] = full_text_search(index, text, limit)
+    return jsonify(query=text, results=results)
+
+@bp.route('/api/scanners/fit')
+def api_scanner_fit():
+    """
+    Scanner models that fit a room: a stored site (?site_spec_id) or one
+    described by the SITE_FIELDS dimensions and ?electrical_power. Answers
+    from the cached catalog; ?source=sql runs the indexed query instead.
+    """
+    site_spec_id = request.args.get('site_spec_id', type=int)
+    if site_spec_id is not None:
+        site = site_values(site_spec_id)
+        if site is None:
+            abort(404)
+    else:
+        site = {name: request.args.get(name, type=float)
+                for name in conformity.DIMENSION_SITE_FIELDS}
+        site.update(zip(conformity.POWER_SITE_FIELDS,
+                        power_spec.parse_power(request.args.get('electrical_power'))))
+
+    if request.args.get('source') == 'sql':
+        items = sorted((row._asdict() for row in fitting_scanners_query(site)),
+                       key=lambda item: item['id'])
+        source = 'sql'
+    else:
+        items = [{'id': record.id, 'name': record.name, 'manufacturer': record.manufacturer}
+                 for record in scanner_catalog.fitting(site)]
+        source = 'catalog'
+    return jsonify(items=items, source=source)
+
+@bp.route('/api/site-specifications/import', methods=['POST'])
+def api_import_site_specifications():
+    """Queue the import of an uploaded .xlsx/.csv sheet; poll the job for per-row errors"""
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify(error='file is required'), 400
+    batch_size = request.args.get('batch_size', 1000, type=int)
+    if batch_size < 1:
+        return jsonify(error='batch_size must be at least 1'), 400
+    job = enqueue_site_import(upload, batch_size)
+    return _job_accepted(job)
+
+@bp.route('/api/ai-evaluations', methods=['POST'])
+def api_queue_ai_evaluations():
+    """Queue an AI evaluation pass over pending reports"""
+    job = enqueue_job('evaluate_ai', {'limit': request.args.get('limit', type=int)})
+    return _job_accepted(job)
+
+JOB_API_FIELDS = ('id', 'kind', 'status', 'priority', 'attempts', 'max_attempts',
+                  'result', 'error', 'created_on', 'started_on', 'finished_on')
+
+def _job_accepted(job):
+    response = jsonify({name: getattr(job, name) for name in JOB_API_FIELDS})
+    response.status_code = 202
+    response.headers['Location'] = url_for('main.api_job', job_id=job.id)
+    return response
+
+@bp.route('/api/jobs/<int:job_id>')
+def api_job(job_id):
+    """Status of a queued job, with its result once done"""
+    job = Job.query.get_or_404(job_id)
+    return jsonify({name: getattr(job, name) for name in JOB_API_FIELDS})
+
+@bp.route('/debug-routes')
 def debug_routes():
     """Show all available routes"""
     output = ["<h2>🔍 Available Routes</h2>"]
     output.append("<div style='font-family: monospace; font-size: 12px;'>")
     
-    for rule in app.url_map.iter_rules():
+    for rule in current_app.url_map.iter_rules():
         methods = ','.join(rule.methods - {'HEAD', 'OPTIONS'})
         output.append(f"<strong>{rule.endpoint}</strong>: {rule.rule} [{methods}]<br>")
     
@@ -572,15 +2224,91 @@ def debug_routes():
     
     return "".join(sorted(output))
 
+@bp.cli.command('init-db')
+def init_db_command():
+    """Create any missing tables."""
+    db.create_all()
+    click.echo('✅ Enhanced database tables created')
+
 # ================================================
-# INITIALIZE DATABASE
+# APP FACTORY
 # ================================================
 
-with app.app_context():
-    db.create_all()
-    print("✅ Enhanced database tables created")
+def create_app(config_name=None):
+    """
+    Build the app for `config_name` (default $FLASK_ENV, else development).
+    The schema is left alone; run `init-db` or the migrations to create it.
+    """
+    app = Flask(__name__)
+
+    # Compiled templates are cached by the Jinja loader; optionally persist the
+    # bytecode across worker restarts as well
+    if os.environ.get('TEMPLATE_BYTECODE_CACHE_DIR'):
+        os.makedirs(os.environ['TEMPLATE_BYTECODE_CACHE_DIR'], exist_ok=True)
+        app.jinja_options = dict(
+            app.jinja_options,
+            bytecode_cache=FileSystemBytecodeCache(os.environ['TEMPLATE_BYTECODE_CACHE_DIR']),
+        )
+
+    # Per-environment settings (engine pool, SQLite pragmas) from config.py
+    config_name = config_name or os.environ.get('FLASK_ENV', 'development')
+    app.config.from_object(config[config_name])
+
+    # Configuration with your real keys; the config class supplies both, so
+    # only an explicit DATABASE_URL overrides its database
+    app.config.setdefault('SECRET_KEY', os.environ.get('SECRET_KEY', os.urandom(24).hex()))
+    if os.environ.get('DATABASE_URL'):
+        app.config['SQLALCHEMY_DATABASE_URI'] = os.environ['DATABASE_URL']
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['APP_NAME'] = 'CT Scanner Preinstallation Manager'
+
+    # Disable Flask-Admin's Babel requirement
+    app.config['BABEL_DEFAULT_LOCALE'] = 'en'
+    app.config['BABEL_DEFAULT_TIMEZONE'] = 'UTC'
+
+    # Caches behind the app_state proxies, configured for this app only
+    app.extensions['ct_scanner'] = {
+        'dashboard_stats': DashboardStats(ttl=app.config['DASHBOARD_STATS_TTL']),
+        'list_count_cache': CountCache(ttl=app.config['DASHBOARD_STATS_TTL']),
+        'scanner_catalog': ScannerCatalog(
+            check_interval=app.config['SCANNER_CATALOG_CHECK_INTERVAL']),
+        'evaluation_cache': EvaluationCache(max_entries=app.config['AI_CACHE_MAX_ENTRIES'],
+                                            max_bytes=app.config['AI_CACHE_MAX_BYTES']),
+        'conformity_refresher': ConformityRefresher(),
+    }
+
+    # Initialize extensions
+    db.init_app(app)
+    sqlite_pragmas.init_app(app, db)
+    instrumentation.configure_logging(app)
+    instrumentation.init_app(app, db)
+    metrics.init_app(app, db, gauges=[
+        ('ct_ai_evaluation_queue_depth', 'Conformity reports waiting for an AI evaluation',
+         pending_ai_count),
+        ('ct_job_queue_depth', 'Jobs waiting for a worker', queued_job_count),
+    ])
+
+    # Flask-Admin uses Flask-Babel whenever it is importable (it is pulled in by
+    # Flask-AppBuilder), and then requires the extension to be registered
+    if Babel is not None:
+        Babel(app)
+
+    init_admin(app)
+    app.register_blueprint(bp)
+    return app
 
 if __name__ == '__main__':
+    if len(sys.argv) > 1:
+        # Management commands, e.g. `python app.py evaluate-ai --limit 100`
+        from flask.cli import FlaskGroup
+        FlaskGroup(create_app=create_app).main()
+
+    app = create_app()
+    # The development server creates the schema on start; workers and
+    # tests call create_app and leave it to `init-db`
+    with app.app_context():
+        db.create_all()
+
     print("🚀 Starting Enhanced CT Scanner Preinstallation Manager...")
     print("🌐 Main page: http://localhost:5000")
     print("🔧 Admin dashboard: http://localhost:5000/admin/")
@@ -1,42 +1,51 @@
-import logging
 import os
 from flask import Flask
 from flask_appbuilder import AppBuilder, SQLA
+from flask_appbuilder.security.manager import AUTH_DB
 from flask_migrate import Migrate
 from dotenv import load_dotenv
 from config import config
+import instrumentation
+import sqlite_pragmas
 
 # Load environment variables
 load_dotenv()
 
-# Create Flask app
-app = Flask(__name__)
-
-# Load configuration
-config_name = os.environ.get('FLASK_ENV', 'development')
-app.config.from_object(config[config_name])
-
-# Initialize extensions
-db = SQLA(app)
-migrate = Migrate(app, db)
-appbuilder = AppBuilder(app, db.session)
-
-# Import models (must be after db initialization)
-try:
-    from . import models
-except ImportError:
-    pass
-
-# Configure logging
-if not app.debug and not app.testing:
-    if not os.path.exists('logs'):
-        os.mkdir('logs')
-    file_handler = logging.FileHandler(app.config.get('LOG_FILE', 'logs/ct_scanner.log'))
-    file_handler.setLevel(getattr(logging, app.config.get('LOG_LEVEL', 'INFO')))
-    formatter = logging.Formatter(
-        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-    )
-    file_handler.setFormatter(formatter)
-    app.logger.addHandler(file_handler)
-    app.logger.setLevel(getattr(logging, app.config.get('LOG_LEVEL', 'INFO')))
-    app.logger.info('CT Scanner App startup')
\ No newline at end of file
+# Extensions are bound to an app in create_app, so importing the package
+# builds nothing (`flask --app app db upgrade` finds the factory)
+db = SQLA()
+migrate = Migrate()
+appbuilder = AppBuilder()
+
+
+def create_app(config_name=None):
+    """Build the AppBuilder app for `config_name` (default $FLASK_ENV, else development)"""
+    app = Flask(__name__)
+
+    # Load configuration
+    config_name = config_name or os.environ.get('FLASK_ENV', 'development')
+    app.config.from_object(config[config_name])
+    # Set here rather than in config.py, which app.py also reads and which
+    # would otherwise import Flask-AppBuilder for it
+    app.config.setdefault('AUTH_TYPE', AUTH_DB)
+
+    with app.app_context():
+        # Initialize extensions
+        db.init_app(app)
+        sqlite_pragmas.init_app(app, db)
+        migrate.init_app(app, db)
+        appbuilder.init_app(app, db.session)
+
+        # Import models (must be after db initialization)
+        try:
+            from . import models  # noqa: F401
+        except ImportError:
+            pass
+        appbuilder.post_init()
+
+    # Configure logging
+    instrumentation.configure_logging(app)
+    instrumentation.init_app(app, db)
+    if not app.debug and not app.testing:
+        app.logger.info('CT Scanner App startup')
+    return app
@@ -0,0 +1,168 @@
+"""
+Latency and SQL statement benchmark for the hot endpoints.
+
+Seeds a scratch database with ``seed_database``, then times the admin
+dashboard, every list page (default, sorted and filtered), the CSV/XLSX
+exports, ``/test``, the JSON listings and the conformity computation.
+Each case reports p50/p95/max latency and the most SQL statements one
+call issued. Results are compared with a JSON baseline and the run fails
+(exit status 1) if a case issues more statements than recorded, or its
+p95 grows beyond the tolerance::
+
+    python benchmarks/bench_endpoints.py --update-baseline
+    python benchmarks/bench_endpoints.py --projects 1000 --sites 10000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from support import ROOT, StatementCounter, admin_views, load_app
+
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+
+
+def sort_arg(view, column):
+    """Flask-Admin `sort` value: the column's position in the list columns"""
+    return [name for name, _ in view._list_columns].index(column)
+
+
+def filter_args(view, label, value):
+    """Query args for the first filter on column `label` (its equality filter)"""
+    for index, flt in enumerate(view._filters):
+        if str(flt.name).lower() == label:
+            return {f'flt0_{view.get_filter_arg(index, flt)}': value}
+    raise LookupError(f'{view.endpoint} has no {label!r} filter')
+
+
+def cases(module, app):
+    """(name, url or callable, query args) for every benchmarked call"""
+    views = admin_views(app)
+
+    yield 'dashboard', '/admin/', {}
+    yield 'system test', '/test', {}
+
+    lists = (
+        ('project', 'name', ('status', 'draft')),
+        ('scannermodel', 'weight', ('manufacturer', 'GE HealthCare')),
+        ('sitespecification', 'room_length', None),
+        ('conformityreport', 'conformity_score', ('pass fail', '1')),
+    )
+    for endpoint, sort_column, flt in lists:
+        view = views[endpoint]
+        url = f'/admin/{endpoint}/'
+        yield f'{endpoint} list', url, {}
+        yield f'{endpoint} list sorted', url, {'sort': sort_arg(view, sort_column), 'desc': 1}
+        if flt:
+            yield f'{endpoint} list filtered', url, filter_args(view, *flt)
+
+    for endpoint in ('project', 'conformityreport'):
+        for export_type in ('csv', 'xlsx'):
+            yield f'{endpoint} export {export_type}', f'/admin/{endpoint}/export/{export_type}/', {}
+
+    yield 'projects api', '/api/projects', {}
+    yield 'conformity reports api', '/api/conformity-reports', {}
+    yield 'evaluate conformity', module.evaluate_conformity, {}
+
+
+def run_case(client, engine, target, params, iterations):
+    if callable(target):
+        call = target
+    else:
+        def call():
+            response = client.get(target, query_string=params)
+            assert response.status_code == 200, (target, response.status_code)
+            response.get_data()  # drain streamed exports
+
+    call()  # warm up lazily-built admin state and caches
+    timings, statements = [], 0
+    for _ in range(iterations):
+        with StatementCounter(engine) as counter:
+            start = time.perf_counter()
+            call()
+            timings.append((time.perf_counter() - start) * 1000)
+        statements = max(statements, counter.count)
+
+    quantiles = statistics.quantiles(timings, n=100, method='inclusive')
+    return {
+        'p50_ms': round(quantiles[49], 3),
+        'p95_ms': round(quantiles[94], 3),
+        'max_ms': round(max(timings), 3),
+        'statements': statements,
+    }
+
+
+def regressions(result, baseline, tolerance, slack_ms):
+    if baseline is None:
+        return []
+    problems = []
+    if result['statements'] > baseline['statements']:
+        problems.append(f"statements {baseline['statements']} -> {result['statements']}")
+    # The slack keeps millisecond endpoints from failing on timer noise
+    if result['p95_ms'] > baseline['p95_ms'] * (1 + tolerance) + slack_ms:
+        problems.append(f"p95 {baseline['p95_ms']:.1f} -> {result['p95_ms']:.1f} ms")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--sites', type=int, default=2000)
+    parser.add_argument('--reports', type=int, default=None)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--tolerance', type=float, default=0.5,
+                        help='allowed p95 growth over the baseline (0.5 = +50%%)')
+    parser.add_argument('--slack-ms', type=float, default=5.0,
+                        help='p95 growth in milliseconds always allowed on top of --tolerance')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true',
+                        help='write this run as the new baseline instead of comparing')
+    args = parser.parse_args()
+
+    module, app = load_app()
+
+    baseline = {}
+    if not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        dataset = {'projects': args.projects, 'sites': args.sites, 'reports': args.reports}
+        if baseline.get('dataset') != dataset:
+            print(f"baseline was recorded for {baseline.get('dataset')}; not comparing")
+            baseline = {}
+
+    with app.app_context():
+        started = time.perf_counter()
+        stats = module.seed_database(args.projects, args.sites, args.reports)
+        print(f"seeded {stats['projects']} projects, {stats['sites']} sites, "
+              f"{stats['reports']} reports in {time.perf_counter() - started:.1f}s")
+        engine = module.db.engine
+
+        client = app.test_client()
+        results, failures = {}, 0
+        for name, target, params in cases(module, app):
+            result = results[name] = run_case(client, engine, target, params, args.iterations)
+            problems = regressions(result, baseline.get('cases', {}).get(name),
+                                   args.tolerance, args.slack_ms)
+            failures += bool(problems)
+            print(f'{"FAIL" if problems else "ok  "} {name:34} p50={result["p50_ms"]:8.2f} ms '
+                  f'p95={result["p95_ms"]:8.2f} ms statements={result["statements"]}'
+                  + (f'  ({"; ".join(problems)})' if problems else ''))
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'dataset': {'projects': args.projects, 'sites': args.sites,
+                                   'reports': args.reports},
+                       'cases': results}, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f'baseline written to {args.baseline}')
+    elif not baseline:
+        print('no baseline; run with --update-baseline to record one')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Dashboard throughput under gunicorn at several worker counts.
+
+Seeds a scratch SQLite database, then for each worker count starts
+gunicorn with gunicorn.conf.py, keeps ``--concurrency`` keep-alive
+clients requesting ``/admin/`` for ``--duration`` seconds and reports
+requests per second and p50/p95 latency::
+
+    python benchmarks/bench_gunicorn.py --workers 1 2 4 8 --threads 1
+
+The clients run in this process, so on a small machine they compete with
+the workers for CPU; compare runs made on the same machine.
+"""
+
+import argparse
+import http.client
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from support import ROOT
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def seed(env, projects, sites):
+    for args in (['init-db'], ['seed', '--projects', str(projects), '--sites', str(sites)]):
+        subprocess.run([sys.executable, os.path.join(ROOT, 'app.py')] + args,
+                       cwd=ROOT, env=env, check=True, stdout=subprocess.DEVNULL)
+
+
+def wait_until_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=5)
+            connection.request('GET', '/admin/')
+            if connection.getresponse().status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f'gunicorn did not answer on port {port}')
+
+
+def load(port, path, concurrency, duration):
+    """Run `concurrency` keep-alive clients for `duration` seconds; returns latencies in ms"""
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop_at = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        local = []
+        while time.monotonic() < stop_at:
+            start = time.perf_counter()
+            try:
+                connection.request('GET', path)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as ex:
+                errors.append(ex)
+                connection.close()
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                continue
+            if response.status != 200:
+                errors.append(response.status)
+            local.append((time.perf_counter() - start) * 1000)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--threads', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--path', default='/admin/')
+    parser.add_argument('--projects', type=int, default=200)
+    parser.add_argument('--sites', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(os.environ,
+                   DATABASE_URL='sqlite:///' + os.path.join(scratch, 'bench.db'),
+                   PROMETHEUS_MULTIPROC_DIR=os.path.join(scratch, 'prometheus'),
+                   GUNICORN_THREADS=str(args.threads),
+                   GUNICORN_ACCESS_LOG='/dev/null')
+        # prometheus_client writes its samples there from the first metric,
+        # including in the seeding commands
+        os.makedirs(env['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+        seed(env, args.projects, args.sites)
+
+        print(f'{"workers":>7} {"req/s":>9} {"p50 ms":>8} {"p95 ms":>8} {"errors":>6}')
+        for workers in args.workers:
+            port = free_port()
+            server = subprocess.Popen(
+                ['gunicorn', '--bind', f'127.0.0.1:{port}'],
+                cwd=ROOT, env=dict(env, GUNICORN_WORKERS=str(workers)),
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_until_ready(port)
+                latencies, errors = load(port, args.path, args.concurrency, args.duration)
+            finally:
+                server.send_signal(signal.SIGTERM)
+                server.wait()
+
+            quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+            print(f'{workers:>7} {len(latencies) / args.duration:>9.1f} '
+                  f'{quantiles[49]:>8.1f} {quantiles[94]:>8.1f} {len(errors):>6}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Worker startup benchmark.
+
+Starts fresh interpreters that import app.py, call ``create_app`` and
+serve a first ``/admin/`` request, the work a gunicorn worker does at
+boot (in preload mode the first two happen once in the master). Reports
+the median of each phase and fails (exit status 1) when import plus
+first request exceeds the target::
+
+    python benchmarks/bench_startup.py --runs 5 --target-ms 1300
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PHASES = ('import', 'create_app', 'first_request')
+
+
+def child():
+    started = time.perf_counter()
+    from support import import_app_module
+    module = import_app_module()
+    imported = time.perf_counter()
+    app = module.create_app()
+    created = time.perf_counter()
+
+    with app.app_context():
+        module.db.create_all()  # scratch database; not part of a worker boot
+    schema_done = time.perf_counter()
+    response = app.test_client().get('/admin/')
+    assert response.status_code == 200, response.status_code
+    served = time.perf_counter()
+
+    print(json.dumps({
+        'import': (imported - started) * 1000,
+        'create_app': (created - imported) * 1000,
+        'first_request': (served - schema_done) * 1000,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--target-ms', type=float, default=1300,
+                        help='limit on median import + create_app + first request')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child()
+        return 0
+
+    runs = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, __file__, '--child'], check=True,
+                                capture_output=True, text=True,
+                                env={**os.environ, 'DATABASE_URL': 'sqlite://'}).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    medians = {phase: statistics.median(run[phase] for run in runs) for phase in PHASES}
+    total = sum(medians.values())
+    for phase in PHASES:
+        print(f'{phase:14} {medians[phase]:8.1f} ms')
+    ok = total <= args.target_ms
+    print(f'{"ok  " if ok else "FAIL"} total {total:.1f} ms (target {args.target_ms:.0f} ms)')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
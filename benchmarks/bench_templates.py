@@ -0,0 +1,52 @@
+"""
+Dashboard rendering benchmark.
+
+Compares the previous per-request ``render_template_string`` path, which
+re-parses and re-compiles the template source on every call, with the
+file-based template that Jinja compiles once and caches::
+
+    python benchmarks/bench_templates.py --requests 2000
+"""
+
+import argparse
+import os
+import time
+
+from support import ROOT, load_app
+
+
+def measure(client, url, requests):
+    client.get(url)  # warm up caches
+    start = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--requests', type=int, default=1000)
+    args = parser.parse_args()
+
+    module, app = load_app()
+
+    with open(os.path.join(ROOT, 'templates', 'dashboard.html')) as f:
+        source = f.read()
+
+    @app.route('/bench/inline-dashboard')
+    def inline_dashboard():
+        from flask import render_template_string
+        return render_template_string(source, **module.dashboard_stats.get())
+
+    client = app.test_client()
+    before = measure(client, '/bench/inline-dashboard', args.requests)
+    after = measure(client, '/admin/', args.requests)
+
+    print(f'render_template_string (before): {before:8.1f} req/s')
+    print(f'render_template        (after):  {after:8.1f} req/s')
+    print(f'speedup: {after / before:.2f}x')
+
+
+if __name__ == '__main__':
+    main()
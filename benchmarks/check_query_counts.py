@@ -0,0 +1,65 @@
+"""
+Query-count guard for the admin list pages.
+
+Seeds a scratch database where every list page shows rows from distinct
+related objects, fetches each page and fails (exit status 1) if any page
+issues more SQL statements than allowed. Lazy loads per row (N+1) show up
+as a count that grows with the page size::
+
+    python benchmarks/check_query_counts.py
+"""
+
+import sys
+
+from support import StatementCounter, load_app
+
+# count + page query, plus one query for filter/action scaffolding at most
+MAX_LIST_STATEMENTS = 4
+
+LIST_PAGES = (
+    '/admin/project/',
+    '/admin/scannermodel/',
+    '/admin/sitespecification/',
+    '/admin/conformityreport/',
+)
+
+
+def seed(module, projects=40, sites_per_project=2):
+    db = module.db
+    module.create_sample_data()
+    for i in range(projects):
+        project = module.Project(name=f'Project {i}', client_name=f'Client {i}')
+        db.session.add(project)
+        db.session.flush()
+        for j in range(sites_per_project):
+            db.session.add(module.SiteSpecification(
+                project_id=project.id, room_length=6.0 + j, room_width=4.5,
+                room_height=2.5, door_width=1.2, door_height=2.1, floor_capacity=900,
+            ))
+    db.session.commit()
+    module.write_conformity_reports()
+
+
+def main():
+    module, app = load_app()
+
+    with app.app_context():
+        seed(module)
+        engine = module.db.engine
+
+    client = app.test_client()
+    failures = 0
+    for url in LIST_PAGES:
+        client.get(url)  # warm up lazily-built admin state
+        with StatementCounter(engine) as counter:
+            response = client.get(url)
+        ok = response.status_code == 200 and counter.count <= MAX_LIST_STATEMENTS
+        failures += not ok
+        print(f'{"ok  " if ok else "FAIL"} {url:32} status={response.status_code} '
+              f'statements={counter.count} (max {MAX_LIST_STATEMENTS})')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+EXPLAIN guard for the admin list queries.
+
+Builds the default list query of every admin view, plus the filtered,
+foreign-key and scanner fit lookups the views and services issue, runs SQLite's
+``EXPLAIN QUERY PLAN`` on each and fails (exit status 1) unless the plan
+uses the expected index::
+
+    python benchmarks/check_query_plans.py
+"""
+
+import sys
+
+from support import admin_views, load_app
+
+
+def explain(db, query):
+    statement = query.statement.compile(db.engine, compile_kwargs={'literal_binds': True})
+    rows = db.session.execute(db.text(f'EXPLAIN QUERY PLAN {statement}')).fetchall()
+    return [row[-1] for row in rows]
+
+
+def list_query(view):
+    _, query = view.get_list(0, None, False, None, [], execute=False)
+    return query
+
+
+def checks(module, app):
+    views = admin_views(app)
+    Project = module.Project
+    SiteSpecification = module.SiteSpecification
+    ScannerModel = module.ScannerModel
+    ConformityReport = module.ConformityReport
+
+    yield ('project list', list_query(views['project']), 'ix_project_created_on')
+    yield ('site specification list', list_query(views['sitespecification']),
+           'ix_site_specification_created_on')
+    yield ('conformity report list', list_query(views['conformityreport']),
+           'ix_conformity_report_created_on')
+    yield ('project status filter',
+           Project.query.filter(Project.status == 'draft'), 'ix_project_status')
+    yield ('scanner manufacturer filter',
+           ScannerModel.query.filter(ScannerModel.manufacturer == 'GE HealthCare'),
+           'ix_scanner_model_manufacturer')
+    yield ('sites of a project',
+           SiteSpecification.query.filter(SiteSpecification.project_id == 1)
+           .order_by(SiteSpecification.created_on.desc()),
+           'ix_site_specification_project_id_created_on')
+    yield ('stale reports',
+           ConformityReport.query.with_entities(ConformityReport.id)
+           .filter(ConformityReport.stale == module.db.true()),
+           'ix_conformity_report_stale')
+    yield ('project list by site count',
+           views['project'].get_list(0, 'summary.site_count', True, None, [], execute=False)[1],
+           'project_summary')
+    yield ('next queued job',
+           module.Job.query.with_entities(module.Job.id)
+           .filter(module.Job.status == 'queued')
+           .order_by(module.Job.priority.desc(), module.Job.id).limit(1),
+           'ix_job_status_priority')
+    yield ('reports pending AI evaluation',
+           module.db.session.query(module.db.func.count(ConformityReport.id))
+           .filter(ConformityReport.ai_evaluation_text.is_(None)),
+           'ix_conformity_report_ai_pending')
+    yield ('reports of a site',
+           ConformityReport.query.filter(ConformityReport.site_spec_id == 1)
+           .order_by(ConformityReport.created_on.desc()),
+           'ix_conformity_report_site_spec_id_created_on')
+    yield ('reports of a scanner',
+           ConformityReport.query.filter(ConformityReport.scanner_model_id == 1)
+           .order_by(ConformityReport.created_on.desc()),
+           'ix_conformity_report_scanner_model_id_created_on')
+    yield ('scanners fitting a room',
+           module.fitting_scanners_query({
+               'room_length': 7.0, 'room_width': 5.0, 'room_height': 3.0,
+               'door_width': 1.5, 'door_height': 2.2, 'floor_capacity': 1000.0,
+           }),
+           'COVERING INDEX ix_scanner_model_fit')
+
+
+def main():
+    module, app = load_app()
+    failures = 0
+
+    with app.test_request_context():
+        for name, query, index in checks(module, app):
+            plan = explain(module.db, query)
+            ok = any(index in step for step in plan)
+            failures += not ok
+            print(f'{"ok  " if ok else "FAIL"} {name:28} expects {index}')
+            if not ok:
+                for step in plan:
+                    print(f'       {step}')
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""
+Seed guard.
+
+Seeds a scratch database in several project batches, checks the row
+counts against the requested totals, then seeds again and checks that the
+second run only skips, and that asking for more reports than site and
+scanner pairs is refused. Fails (exit status 1) on any mismatch::
+
+    python benchmarks/check_seed.py
+"""
+
+import sys
+
+from support import load_app
+
+PROJECTS = 25
+SITES = 80
+REPORTS = 300
+BATCH_SIZE = 10  # three batches, the last one partial
+
+
+def main():
+    module, app = load_app()
+    db = module.db
+    failures = 0
+
+    def check(name, actual, expected):
+        nonlocal failures
+        ok = actual == expected
+        failures += not ok
+        print(f'{"ok  " if ok else "FAIL"} {name:24} {actual} (expected {expected})')
+
+    with app.app_context():
+        stats = module.seed_database(PROJECTS, SITES, REPORTS, batch_size=BATCH_SIZE)
+        check('projects seeded', stats['projects'], PROJECTS)
+        check('sites seeded', stats['sites'], SITES)
+        check('reports seeded', stats['reports'], REPORTS)
+        check('site rows', db.session.query(module.SiteSpecification).count(), SITES)
+        check('report rows', db.session.query(module.ConformityReport).count(), REPORTS)
+
+        again = module.seed_database(PROJECTS, SITES, REPORTS, batch_size=BATCH_SIZE)
+        check('rerun skipped', again['skipped'], PROJECTS)
+        check('rerun sites', again['sites'], 0)
+
+        pairs = SITES * len(module.scanner_catalog.get().records)
+        try:
+            module.seed_database(PROJECTS, SITES, pairs + 1, batch_size=BATCH_SIZE)
+            refused = False
+        except ValueError:
+            refused = True
+        check('reports over pairs', refused, True)
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Local stand-in for the OpenAI chat completions endpoint.
+
+Answers ``POST /v1/chat/completions`` with a canned evaluation after an
+optional delay, and can answer every Nth request with a 429 or 503 to
+exercise the retry and rate-limit handling of ai_evaluation::
+
+    python benchmarks/stub_openai_server.py --port 8765 --rate-limit-every 5
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://127.0.0.1:8765/v1 \\
+        python app.py evaluate-ai
+"""
+
+import argparse
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_handler(options):
+    counter = itertools.count(1)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            if options.verbose:
+                super().log_message(format, *args)
+
+        def _reply(self, status, body, headers=()):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            with lock:
+                number = next(counter)
+
+            if not self.path.endswith('/chat/completions'):
+                return self._reply(404, {'error': {'message': 'not found'}})
+            if options.rate_limit_every and number % options.rate_limit_every == 0:
+                return self._reply(429, {'error': {'message': 'rate limited'}},
+                                   [('Retry-After', str(options.retry_after))])
+            if options.fail_every and number % options.fail_every == 0:
+                return self._reply(503, {'error': {'message': 'unavailable'}})
+
+            time.sleep(options.latency)
+            prompt = payload['messages'][-1]['content']
+            content = f'Stub evaluation #{number}: {len(prompt)} characters of site data reviewed.'
+            self._reply(200, {
+                'id': f'stub-{number}',
+                'object': 'chat.completion',
+                'model': payload.get('model'),
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': content}}],
+            })
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per completion')
+    parser.add_argument('--rate-limit-every', type=int, default=0)
+    parser.add_argument('--retry-after', type=float, default=0.2)
+    parser.add_argument('--fail-every', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true')
+    options = parser.parse_args()
+
+    server = ThreadingHTTPServer((options.host, options.port), make_handler(options))
+    print(f'Stub OpenAI API on http://{options.host}:{options.port}/v1')
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Shared helpers for the benchmark and guard scripts."""
+
+import importlib.util
+import os
+import sys
+
+from sqlalchemy import event
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_app_module():
+    """Import app.py by path; the app/ package shadows it as `app`"""
+    sys.path.insert(0, ROOT)
+    spec = importlib.util.spec_from_file_location('ct_app', os.path.join(ROOT, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules['ct_app'] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_app(database_url='sqlite://'):
+    """
+    Build app.py's app against a scratch database instead of ct_install.db
+    and create its schema; returns (module, app)
+    """
+    os.environ.setdefault('DATABASE_URL', database_url)
+    module = import_app_module()
+    app = module.create_app()
+    with app.app_context():
+        module.db.create_all()
+    return module, app
+
+
+def admin_views(app):
+    """The app's Flask-Admin views by endpoint"""
+    return {view.endpoint: view for view in app.extensions['admin'][0]._views}
+
+
+class StatementCounter:
+    """Count SQL statements executed on an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _before_cursor_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(self.engine, 'before_cursor_execute', self._before_cursor_execute)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, 'before_cursor_execute', self._before_cursor_execute)
@@ -1,5 +1,5 @@
 import os
-from flask_appbuilder.security.manager import AUTH_DB
+from sqlalchemy.pool import QueuePool
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 
@@ -9,9 +9,66 @@ class Config:
         'sqlite:///' + os.path.join(basedir, 'ct_install.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     APP_NAME = "CT Scanner Manager"
-    AUTH_TYPE = AUTH_DB
+
+    # PRAGMA name -> value, applied to every new SQLite connection
+    SQLITE_PRAGMAS = {}
+
+    # Seconds the dashboard counts are served from memory; at most this
+    # often does a worker look for scanner catalog changes made elsewhere
+    DASHBOARD_STATS_TTL = int(os.environ.get('DASHBOARD_STATS_TTL', '30'))
+    SCANNER_CATALOG_CHECK_INTERVAL = float(os.environ.get('SCANNER_CATALOG_CHECK_INTERVAL', '1'))
+
+    # Rescore reports made stale by a spec edit in a background thread right
+    # after the commit; otherwise `python app.py reevaluate` does it
+    CONFORMITY_AUTO_REFRESH = os.environ.get('CONFORMITY_AUTO_REFRESH', '1') == '1'
+
+    # Job queue (`python app.py worker`): uploads are saved to JOB_FILES_DIR
+    # for the workers, which must run on the same host; a job is handed to
+    # another worker once its lease goes JOB_LEASE_SECONDS without a heartbeat
+    WORKER_THREADS = int(os.environ.get('WORKER_THREADS', '4'))
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', '1'))
+    JOB_LEASE_SECONDS = int(os.environ.get('JOB_LEASE_SECONDS', '60'))
+    JOB_RETRY_DELAY = int(os.environ.get('JOB_RETRY_DELAY', '30'))  # doubles per attempt
+    JOB_FILES_DIR = os.environ.get('JOB_FILES_DIR') or os.path.join(basedir, 'instance', 'jobs')
+
+    # Statements at least this slow are logged with their plan; 0 disables
+    SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '250'))
+
+    # AI conformity evaluation (any OpenAI-compatible endpoint)
+    OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY')
+    OPENAI_BASE_URL = os.environ.get('OPENAI_BASE_URL', 'https://api.openai.com/v1')
+    OPENAI_MODEL = os.environ.get('OPENAI_MODEL', 'gpt-4o-mini')
+    AI_EVALUATION_CONCURRENCY = int(os.environ.get('AI_EVALUATION_CONCURRENCY', '4'))
+    AI_EVALUATION_MAX_RETRIES = int(os.environ.get('AI_EVALUATION_MAX_RETRIES', '5'))
+    AI_EVALUATION_BATCH_SIZE = int(os.environ.get('AI_EVALUATION_BATCH_SIZE', '50'))
+    # Evaluations cached by content; least recently used entries are evicted
+    # past either limit
+    AI_CACHE_MAX_ENTRIES = int(os.environ.get('AI_CACHE_MAX_ENTRIES', '50000'))
+    AI_CACHE_MAX_BYTES = int(os.environ.get('AI_CACHE_MAX_BYTES', str(100 * 1024 * 1024)))
+
+class ProductionConfig(Config):
+    # WAL lets readers proceed while one writer commits; busy_timeout makes
+    # concurrent writers wait instead of failing with "database is locked"
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', '5000')),
+        'cache_size': -64000,        # KiB, ~64 MB page cache per connection
+        'mmap_size': 268435456,      # 256 MB memory-mapped reads
+        'temp_store': 'MEMORY',
+    }
+    # Keep connections (and their page caches) open across requests rather
+    # than reconnecting on every checkout
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': QueuePool,
+        'pool_size': int(os.environ.get('SQLALCHEMY_POOL_SIZE', '5')),
+        'max_overflow': int(os.environ.get('SQLALCHEMY_MAX_OVERFLOW', '10')),
+        'pool_recycle': 3600,
+        'connect_args': {'check_same_thread': False},
+    }
 
 config = {
     'development': Config,
+    'production': ProductionConfig,
     'default': Config
-}
\ No newline at end of file
+}
@@ -0,0 +1,136 @@
+"""
+Vectorized conformity engine.
+
+Scores every site specification against every scanner model in one pass.
+Inputs are plain NumPy arrays (one row per site / scanner, columns in the
+order of SITE_FIELDS / SCANNER_FIELDS); missing database values are NaN.
+"""
+
+import hashlib
+from typing import NamedTuple
+
+import numpy as np
+
+DIMENSION_SITE_FIELDS = ('room_length', 'room_width', 'room_height',
+                         'door_width', 'door_height', 'floor_capacity')
+DIMENSION_SCANNER_FIELDS = ('min_room_length', 'min_room_width', 'min_room_height',
+                            'min_door_width', 'weight')
+# Parsed from the electrical_power / power_requirement text (power_spec)
+POWER_SITE_FIELDS = ('supply_voltage', 'supply_kva', 'supply_phase')
+POWER_SCANNER_FIELDS = ('power_voltage', 'power_kva', 'power_phase')
+
+SITE_FIELDS = DIMENSION_SITE_FIELDS + POWER_SITE_FIELDS
+SCANNER_FIELDS = DIMENSION_SCANNER_FIELDS + POWER_SCANNER_FIELDS
+
+CHECKS = ('room_length', 'room_width', 'room_height',
+          'door_width', 'door_height', 'floor_load',
+          'supply_voltage', 'supply_kva', 'supply_phase')
+# Sites often leave the electrical supply blank; those checks are skipped
+# for such sites rather than failed
+OPTIONAL_CHECKS = ('supply_voltage', 'supply_kva', 'supply_phase')
+
+# Scanner rows carry no door height or footprint, so these defaults are used
+# to derive the corresponding requirements.
+DEFAULT_MIN_DOOR_HEIGHT = 2.0  # m
+DEFAULT_FOOTPRINT_AREA = 2.0   # m², gantry footprint the weight rests on
+VOLTAGE_TOLERANCE = 0.1        # supply voltage may deviate ±10% from the rating
+
+
+class ConformityMatrix(NamedTuple):
+    """Sites x scanners results; `margins` and `ratios` add a CHECKS axis."""
+    margins: np.ndarray
+    ratios: np.ndarray
+    conformity_score: np.ndarray
+    pass_fail: np.ndarray
+    critical_issues: np.ndarray
+
+
+def as_matrix(rows, width):
+    """Build a float matrix from DB rows, mapping None to NaN"""
+    matrix = np.array(rows, dtype=float)
+    return matrix.reshape(-1, width)
+
+
+def row_fingerprints(rows, width):
+    """
+    16-hex-digit digest of each row's values. A report stores its site's
+    fingerprint followed by its scanner's, so a changed input shows up as
+    a mismatch without rescoring.
+    """
+    matrix = np.ascontiguousarray(as_matrix(rows, width))
+    return [hashlib.blake2b(row.tobytes(), digest_size=8).hexdigest() for row in matrix]
+
+
+def score_matrix(sites, scanners,
+                 min_door_height=DEFAULT_MIN_DOOR_HEIGHT,
+                 footprint_area=DEFAULT_FOOTPRINT_AREA):
+    """
+    Score sites (n x len(SITE_FIELDS)) against scanners (m x len(SCANNER_FIELDS)).
+
+    A check passes when the site value meets the requirement or the scanner
+    states no requirement. A site value that is missing fails the check
+    without counting as a critical issue, so incomplete sites never pass;
+    OPTIONAL_CHECKS are skipped instead. The supply voltage must match the
+    rating within VOLTAGE_TOLERANCE rather than exceed it.
+    """
+    sites = as_matrix(sites, len(SITE_FIELDS))
+    scanners = as_matrix(scanners, len(SCANNER_FIELDS))
+    m = len(scanners)
+
+    # (m, k) requirements and (n, k) provided values, aligned on CHECKS
+    required = np.column_stack([
+        scanners[:, 0],
+        scanners[:, 1],
+        scanners[:, 2],
+        scanners[:, 3],
+        np.full(m, min_door_height),
+        scanners[:, 4] / footprint_area,
+        scanners[:, 5],
+        scanners[:, 6],
+        scanners[:, 7],
+    ])
+    provided = sites[:, None, :]
+    required = required[None, :, :]
+    margins = provided - required
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.clip(provided / required, 0.0, 1.0)
+
+    optional = np.isin(CHECKS, OPTIONAL_CHECKS)
+    missing = np.broadcast_to(np.isnan(provided), margins.shape)
+    no_requirement = np.isnan(required) | (required <= 0) | (missing & optional)
+    unknown = missing & ~no_requirement
+
+    failed = margins < 0
+    voltage = CHECKS.index('supply_voltage')
+    with np.errstate(invalid='ignore'):
+        mismatch = np.abs(margins[..., voltage]) > VOLTAGE_TOLERANCE * required[..., voltage]
+    failed[..., voltage] = mismatch
+    ratios[..., voltage] = np.where(mismatch, 0.0, 1.0)
+    failed &= ~no_requirement
+
+    ratios = np.where(no_requirement, 1.0, ratios)
+    ratios = np.where(unknown, 0.0, ratios)
+
+    conformity_score = np.round(ratios.mean(axis=2) * 100.0, 1)
+    critical_issues = failed.sum(axis=2)
+    pass_fail = ~(failed | unknown).any(axis=2)
+
+    return ConformityMatrix(
+        margins=margins,
+        ratios=ratios,
+        conformity_score=conformity_score,
+        pass_fail=pass_fail,
+        critical_issues=critical_issues,
+    )
+
+
+def score_partition(sites, scanners):
+    """
+    score_matrix for a ProcessPoolExecutor worker: returns only the
+    (conformity_score, pass_fail, critical_issues) arrays and the site
+    fingerprints, keeping the pickled result small.
+    """
+    result = score_matrix(sites, scanners)
+    return (result.conformity_score, result.pass_fail, result.critical_issues,
+            row_fingerprints(sites, len(SITE_FIELDS)))
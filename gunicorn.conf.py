@@ -0,0 +1,63 @@
+"""
+Gunicorn production profile, read automatically from the working directory::
+
+    gunicorn
+    GUNICORN_WORKERS=4 GUNICORN_THREADS=4 gunicorn
+
+The app is loaded once in the master (preload_app) and forked, so workers
+share its imported modules and compiled templates copy-on-write. Workers
+are recycled after GUNICORN_MAX_REQUESTS requests, with jitter so they do
+not all restart together, to cap memory growth. GUNICORN_THREADS above 1
+switches to the gthread worker. Send TTIN/TTOU to the master to add or
+remove a worker, HUP to reload the workers gracefully.
+"""
+
+import glob
+import multiprocessing
+import os
+import sys
+import tempfile
+
+wsgi_app = 'wsgi:app'
+bind = os.environ.get('GUNICORN_BIND', '127.0.0.1:8000')
+
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', '1'))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+
+preload_app = True
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', '5'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+# Workers share one Prometheus multiprocess directory (see metrics.py). It
+# must be set before the app is imported, so it is set here.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR',
+                      os.path.join(tempfile.gettempdir(), 'ct_scanner_prometheus'))
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+def on_starting(server):
+    # Once per master start, not on HUP reloads: drop the previous run's
+    # samples. Only prometheus_client's own files go; the directory itself
+    # may be one the operator chose and shares with other files.
+    for path in glob.glob(os.path.join(os.environ['PROMETHEUS_MULTIPROC_DIR'], '*.db')):
+        os.remove(path)
+
+
+def post_fork(server, worker):
+    # Connections must not cross the fork; each worker opens its own
+    wsgi = sys.modules.get('wsgi')
+    if wsgi is not None:
+        with wsgi.app.app_context():
+            wsgi.db.engine.dispose()
+
+
+def child_exit(server, worker):
+    import metrics
+    metrics.mark_process_dead(worker.pid)
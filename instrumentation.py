@@ -0,0 +1,114 @@
+"""
+Request and SQL instrumentation.
+
+Times every request and the SQL statements it runs (via the engine's
+``before_cursor_execute`` / ``after_cursor_execute`` events), reports the
+totals in a ``Server-Timing`` header and one ``key=value`` log line per
+request, and logs any statement slower than ``SLOW_QUERY_MS`` together
+with its EXPLAIN plan.
+"""
+
+import logging
+import os
+import time
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
+
+
+def configure_logging(app):
+    """File handler for app.logger outside debug/testing runs"""
+    if app.debug or app.testing:
+        return
+    if not os.path.exists('logs'):
+        os.mkdir('logs')
+    file_handler = logging.FileHandler(app.config.get('LOG_FILE', 'logs/ct_scanner.log'))
+    file_handler.setLevel(getattr(logging, app.config.get('LOG_LEVEL', 'INFO')))
+    formatter = logging.Formatter(
+        '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
+    )
+    file_handler.setFormatter(formatter)
+    app.logger.addHandler(file_handler)
+    app.logger.setLevel(getattr(logging, app.config.get('LOG_LEVEL', 'INFO')))
+
+
+def explain(cursor, statement, parameters):
+    """Plan rows for `statement`, run on the same DBAPI connection (no engine events)"""
+    prefix = 'EXPLAIN QUERY PLAN ' if cursor.__class__.__module__.startswith('sqlite3') else 'EXPLAIN '
+    plan_cursor = cursor.connection.cursor()
+    try:
+        plan_cursor.execute(prefix + statement, parameters or ())
+        return [' '.join(str(value) for value in row) for row in plan_cursor.fetchall()]
+    finally:
+        plan_cursor.close()
+
+
+# SELECTs report no rowcount in SQLite, so rows returned are counted as the
+# ORM loads them. Registered once for every mapper, whatever app is active.
+@event.listens_for(Mapper, 'load')
+def _count_loaded_row(target, context):
+    if has_request_context() and 'sql_rows' in g:
+        g.sql_rows += 1
+
+
+def init_app(app, db):
+    """Register the request hooks on `app` and the SQL hooks on its engine"""
+    slow_query_ms = app.config.get('SLOW_QUERY_MS')
+    logger = app.logger
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _start_statement(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('statement_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _end_statement(conn, cursor, statement, parameters, context, executemany):
+        elapsed = (time.perf_counter() - conn.info['statement_start'].pop()) * 1000
+        if has_request_context() and 'sql_statements' in g:
+            g.sql_statements += 1
+            g.sql_ms += elapsed
+            if cursor.rowcount > 0:
+                g.sql_rows += cursor.rowcount
+
+        if slow_query_ms and elapsed >= slow_query_ms:
+            plan = []
+            if not executemany and statement.lstrip()[:6].upper() == 'SELECT':
+                try:
+                    plan = explain(cursor, statement, parameters)
+                except Exception as ex:  # the plan is best effort
+                    plan = [f'unavailable: {ex}']
+            logger.warning('slow query %.1fms path=%s: %s\n  plan: %s', elapsed,
+                           request.path if has_request_context() else '-',
+                           statement, '\n        '.join(plan) or '-')
+
+    @event.listens_for(engine, 'handle_error')
+    def _abandon_statement(context):
+        if context.connection is not None and context.connection.info.get('statement_start'):
+            context.connection.info['statement_start'].pop()
+
+    @app.before_request
+    def _start_request():
+        g.request_start = time.perf_counter()
+        g.sql_statements = 0
+        g.sql_ms = 0.0
+        g.sql_rows = 0
+
+    @app.after_request
+    def _report_request(response):
+        if 'request_start' not in g:
+            return response
+        # Streamed responses (exports) are timed up to the first byte
+        total_ms = (time.perf_counter() - g.request_start) * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'app;dur={total_ms:.1f}, '
+            f'db;dur={g.sql_ms:.1f};desc="{g.sql_statements} statements, {g.sql_rows} rows"',
+        )
+        logger.info('request method=%s path=%s endpoint=%s status=%s duration_ms=%.1f '
+                    'sql_statements=%d sql_ms=%.1f sql_rows=%d',
+                    request.method, request.path, request.endpoint, response.status_code,
+                    total_ms, g.sql_statements, g.sql_ms, g.sql_rows)
+        return response
@@ -0,0 +1,158 @@
+"""
+Prometheus metrics.
+
+Request latency per endpoint, DB pool usage, cache hit/miss counts and
+conformity/AI evaluation throughput, served at ``/metrics``. Under
+gunicorn set ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory shared by
+the workers: each process then writes its samples to memory-mapped files
+there and the scrape sums them, whichever worker answers it. Call
+``mark_process_dead`` from gunicorn's ``child_exit`` hook so live gauges
+drop exited workers.
+
+Without prometheus_client installed every metric is a no-op and
+``/metrics`` is not registered.
+"""
+
+import os
+import time
+
+from flask import Response, g, request
+from sqlalchemy import event
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+    from prometheus_client.core import GaugeMetricFamily
+except ImportError:  # metrics are optional
+    prometheus_client = None
+
+
+class _NullMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def dec(self, amount=1):
+        pass
+
+    def observe(self, amount):
+        pass
+
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        'ct_request_duration_seconds', 'Request latency', ('endpoint', 'method'))
+    POOL_CHECKED_OUT = prometheus_client.Gauge(
+        'ct_db_pool_checked_out', 'Connections checked out of the pool',
+        multiprocess_mode='livesum')
+    POOL_CONNECTIONS = prometheus_client.Gauge(
+        'ct_db_pool_connections', 'Open DBAPI connections', multiprocess_mode='livesum')
+    CACHE_LOOKUPS = prometheus_client.Counter(
+        'ct_cache_lookups', 'Cache lookups by result', ('cache', 'result'))
+    CONFORMITY_PAIRS = prometheus_client.Counter(
+        'ct_conformity_pairs_scored', 'Site/scanner pairs scored by the conformity engine')
+    AI_EVALUATIONS = prometheus_client.Counter(
+        'ct_ai_evaluations', 'AI evaluation outcomes: api, cache or failed',
+        ('source',))
+else:
+    REQUEST_LATENCY = POOL_CHECKED_OUT = POOL_CONNECTIONS = CACHE_LOOKUPS = \
+        CONFORMITY_PAIRS = AI_EVALUATIONS = _NullMetric()
+
+_cache_children = {}
+_registered_gauges = set()
+
+
+def cache_lookup(cache, hit, amount=1):
+    """Count `amount` hits or misses of the named cache"""
+    key = (cache, hit)
+    child = _cache_children.get(key)
+    if child is None:
+        child = _cache_children[key] = CACHE_LOOKUPS.labels(cache, 'hit' if hit else 'miss')
+    if amount:
+        child.inc(amount)
+
+
+def multiprocess_dir():
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR') or os.environ.get('prometheus_multiproc_dir')
+
+
+def mark_process_dead(pid):
+    """gunicorn child_exit hook: drop the exited worker's live gauges"""
+    if prometheus_client is not None and multiprocess_dir():
+        multiprocess.mark_process_dead(pid)
+
+
+class _GaugeCollector:
+    """Gauge read from `read()` at scrape time, so every worker reports the same value"""
+
+    def __init__(self, name, documentation, read):
+        self.name = name
+        self.documentation = documentation
+        self.read = read
+
+    def describe(self):
+        return [GaugeMetricFamily(self.name, self.documentation)]
+
+    def collect(self):
+        yield GaugeMetricFamily(self.name, self.documentation, value=self.read())
+
+
+def init_app(app, db, gauges=()):
+    """
+    Time requests, track the engine's pool and serve /metrics. `gauges` is
+    a sequence of (name, documentation, read) evaluated on each scrape.
+    """
+    if prometheus_client is None:
+        return
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'connect')
+    def _connected(dbapi_connection, connection_record):
+        POOL_CONNECTIONS.inc()
+
+    @event.listens_for(engine, 'close')
+    def _closed(dbapi_connection, connection_record):
+        POOL_CONNECTIONS.dec()
+
+    @event.listens_for(engine, 'checkout')
+    def _checked_out(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKED_OUT.inc()
+
+    @event.listens_for(engine, 'checkin')
+    def _checked_in(dbapi_connection, connection_record):
+        POOL_CHECKED_OUT.dec()
+
+    @app.before_request
+    def _start_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def _observe_latency(response):
+        if 'metrics_start' in g:
+            REQUEST_LATENCY.labels(request.endpoint or 'unmatched', request.method) \
+                .observe(time.perf_counter() - g.metrics_start)
+        return response
+
+    collectors = [_GaugeCollector(*gauge) for gauge in gauges]
+    if not multiprocess_dir():
+        for collector in collectors:
+            # A second app in the same process reuses the first registration
+            if collector.name not in _registered_gauges:
+                prometheus_client.REGISTRY.register(collector)
+                _registered_gauges.add(collector.name)
+
+    @app.route('/metrics')
+    def metrics():
+        if multiprocess_dir():
+            registry = prometheus_client.CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            for collector in collectors:
+                registry.register(collector)
+        else:
+            registry = prometheus_client.REGISTRY
+        return Response(prometheus_client.generate_latest(registry),
+                        mimetype=prometheus_client.CONTENT_TYPE_LATEST)
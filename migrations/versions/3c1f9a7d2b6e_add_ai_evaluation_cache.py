@@ -0,0 +1,39 @@
+"""add content-addressed AI evaluation cache
+
+Revision ID: 3c1f9a7d2b6e
+Revises: 84e8e4ead94d
+Create Date: 2026-10-16 22:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c1f9a7d2b6e'
+down_revision = '84e8e4ead94d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('ai_evaluation_cache'):
+        return
+    op.create_table(
+        'ai_evaluation_cache',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('prompt_version', sa.Integer(), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=True),
+        sa.Column('evaluation_text', sa.Text(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('hits', sa.Integer(), nullable=False),
+        sa.Column('created_on', sa.DateTime(), nullable=True),
+        sa.Column('last_used_on', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('key'),
+    )
+    op.create_index('ix_ai_evaluation_cache_last_used_on', 'ai_evaluation_cache', ['last_used_on'])
+
+
+def downgrade():
+    op.drop_index('ix_ai_evaluation_cache_last_used_on', table_name='ai_evaluation_cache')
+    op.drop_table('ai_evaluation_cache')
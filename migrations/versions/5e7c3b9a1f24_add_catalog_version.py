@@ -0,0 +1,31 @@
+"""add catalog_version table for in-memory catalog staleness checks
+
+Revision ID: 5e7c3b9a1f24
+Revises: d4a8e2f61b90
+Create Date: 2026-10-17 11:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e7c3b9a1f24'
+down_revision = 'd4a8e2f61b90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('catalog_version'):
+        return
+    op.create_table(
+        'catalog_version',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+
+
+def downgrade():
+    op.drop_table('catalog_version')
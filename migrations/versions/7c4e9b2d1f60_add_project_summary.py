@@ -0,0 +1,43 @@
+"""add trigger-maintained project_summary table
+
+Revision ID: 7c4e9b2d1f60
+Revises: a6d1f8c3e497
+Create Date: 2026-10-17 20:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import project_summary
+
+
+# revision identifiers, used by Alembic.
+revision = '7c4e9b2d1f60'
+down_revision = 'a6d1f8c3e497'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('project_summary'):
+        op.create_table(
+            'project_summary',
+            sa.Column('project_id', sa.Integer(), nullable=False),
+            sa.Column('site_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('report_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('pass_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('fail_count', sa.Integer(), nullable=False, server_default='0'),
+            sa.Column('best_score', sa.Float(), nullable=True),
+            sa.Column('total_estimated_cost', sa.Float(), nullable=False, server_default='0'),
+            sa.ForeignKeyConstraint(['project_id'], ['project.id']),
+            sa.PrimaryKeyConstraint('project_id'),
+        )
+    # Triggers, then summaries of the projects written before them
+    for statement in project_summary.ddl():
+        op.execute(statement)
+
+
+def downgrade():
+    for statement in project_summary.drop_ddl():
+        op.execute(statement)
+    op.drop_table('project_summary')
@@ -0,0 +1,51 @@
+"""add indexes for admin list sorting and foreign keys
+
+Revision ID: 84e8e4ead94d
+Revises: 
+Create Date: 2026-10-16 20:45:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '84e8e4ead94d'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (index name, table, columns)
+INDEXES = [
+    ('ix_project_created_on', 'project', ['created_on']),
+    ('ix_project_status', 'project', ['status']),
+    ('ix_scanner_model_manufacturer', 'scanner_model', ['manufacturer']),
+    ('ix_site_specification_created_on', 'site_specification', ['created_on']),
+    ('ix_site_specification_project_id_created_on', 'site_specification', ['project_id', 'created_on']),
+    ('ix_conformity_report_created_on', 'conformity_report', ['created_on']),
+    ('ix_conformity_report_site_spec_id_created_on', 'conformity_report', ['site_spec_id', 'created_on']),
+    ('ix_conformity_report_scanner_model_id_created_on', 'conformity_report', ['scanner_model_id', 'created_on']),
+]
+
+
+def _existing_indexes(table):
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table):
+        return None
+    return {index['name'] for index in inspector.get_indexes(table)}
+
+
+def upgrade():
+    # Databases created by db.create_all() after the models gained these
+    # indexes already have them
+    for name, table, columns in INDEXES:
+        existing = _existing_indexes(table)
+        if existing is not None and name not in existing:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        existing = _existing_indexes(table)
+        if existing and name in existing:
+            op.drop_index(name, table_name=table)
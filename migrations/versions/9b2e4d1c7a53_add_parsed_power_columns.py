@@ -0,0 +1,53 @@
+"""add parsed electrical supply columns
+
+Revision ID: 9b2e4d1c7a53
+Revises: 3c1f9a7d2b6e
+Create Date: 2026-10-16 23:05:00.000000
+
+Existing rows are filled in by `python app.py backfill-power`.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2e4d1c7a53'
+down_revision = '3c1f9a7d2b6e'
+branch_labels = None
+depends_on = None
+
+# (table, column, type)
+COLUMNS = [
+    ('scanner_model', 'power_voltage', sa.Float()),
+    ('scanner_model', 'power_kva', sa.Float()),
+    ('scanner_model', 'power_phase', sa.Integer()),
+    ('site_specification', 'supply_voltage', sa.Float()),
+    ('site_specification', 'supply_kva', sa.Float()),
+    ('site_specification', 'supply_phase', sa.Integer()),
+]
+INDEXES = [
+    ('ix_scanner_model_power_phase_power_kva', 'scanner_model', ['power_phase', 'power_kva']),
+    ('ix_site_specification_supply_kva', 'site_specification', ['supply_kva']),
+]
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    for table, column, type_ in COLUMNS:
+        existing = {col['name'] for col in inspector.get_columns(table)}
+        if column not in existing:
+            op.add_column(table, sa.Column(column, type_, nullable=True))
+    for name, table, columns in INDEXES:
+        if name not in {index['name'] for index in inspector.get_indexes(table)}:
+            op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
+    for table in ('site_specification', 'scanner_model'):
+        with op.batch_alter_table(table) as batch_op:
+            for column_table, column, type_ in reversed(COLUMNS):
+                if column_table == table:
+                    batch_op.drop_column(column)
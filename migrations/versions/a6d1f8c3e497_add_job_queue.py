@@ -0,0 +1,50 @@
+"""add job table for the background job queue
+
+Revision ID: a6d1f8c3e497
+Revises: e2c9a4f7b318
+Create Date: 2026-10-17 18:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a6d1f8c3e497'
+down_revision = 'e2c9a4f7b318'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table('job'):
+        return
+    op.create_table(
+        'job',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=50), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=True),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('max_attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('lease_token', sa.String(length=32), nullable=True),
+        sa.Column('lease_expires', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_on', sa.DateTime(), nullable=True),
+        sa.Column('worker', sa.String(length=100), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_on', sa.DateTime(), nullable=True),
+        sa.Column('started_on', sa.DateTime(), nullable=True),
+        sa.Column('finished_on', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('lease_token'),
+    )
+    op.create_index('ix_job_status_priority', 'job',
+                    ['status', sa.text('priority DESC'), 'id'])
+
+
+def downgrade():
+    op.drop_index('ix_job_status_priority', table_name='job')
+    op.drop_table('job')
@@ -0,0 +1,31 @@
+"""add FTS5 search indexes over project and scanner_model
+
+Revision ID: b7f3d2a9c5e1
+Revises: 5e7c3b9a1f24
+Create Date: 2026-10-17 14:40:00.000000
+
+"""
+from alembic import op
+
+import search
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7f3d2a9c5e1'
+down_revision = '5e7c3b9a1f24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    for index in search.INDEXES:
+        for statement in index.ddl():
+            op.execute(statement)
+        # Index the rows written before the triggers existed
+        op.execute(index.rebuild_sql())
+
+
+def downgrade():
+    for index in search.INDEXES:
+        for statement in index.drop_ddl():
+            op.execute(statement)
@@ -0,0 +1,27 @@
+"""add partial index over conformity reports awaiting an AI evaluation
+
+Revision ID: c8b5e1a3d702
+Revises: 7c4e9b2d1f60
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8b5e1a3d702'
+down_revision = '7c4e9b2d1f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('conformity_report')}
+    if 'ix_conformity_report_ai_pending' not in existing:
+        op.create_index('ix_conformity_report_ai_pending', 'conformity_report', ['id'],
+                        sqlite_where=sa.text('ai_evaluation_text IS NULL'))
+
+
+def downgrade():
+    op.drop_index('ix_conformity_report_ai_pending', table_name='conformity_report')
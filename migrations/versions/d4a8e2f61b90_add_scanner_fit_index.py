@@ -0,0 +1,29 @@
+"""add covering index for scanner fit lookups
+
+Revision ID: d4a8e2f61b90
+Revises: 9b2e4d1c7a53
+Create Date: 2026-10-17 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a8e2f61b90'
+down_revision = '9b2e4d1c7a53'
+branch_labels = None
+depends_on = None
+
+COLUMNS = ['min_room_length', 'min_room_width', 'min_room_height', 'min_door_width', 'weight',
+           'power_kva', 'power_phase', 'power_voltage', 'name', 'manufacturer']
+
+
+def upgrade():
+    existing = {index['name'] for index in sa.inspect(op.get_bind()).get_indexes('scanner_model')}
+    if 'ix_scanner_model_fit' not in existing:
+        op.create_index('ix_scanner_model_fit', 'scanner_model', COLUMNS)
+
+
+def downgrade():
+    op.drop_index('ix_scanner_model_fit', table_name='scanner_model')
@@ -0,0 +1,39 @@
+"""add input fingerprint and stale flag to conformity_report
+
+Revision ID: e2c9a4f7b318
+Revises: b7f3d2a9c5e1
+Create Date: 2026-10-17 16:20:00.000000
+
+Reports written before this revision have no fingerprint; run
+`python app.py reevaluate --verify` once to flag and rescore them.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2c9a4f7b318'
+down_revision = 'b7f3d2a9c5e1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing = {col['name'] for col in inspector.get_columns('conformity_report')}
+    if 'input_fingerprint' not in existing:
+        op.add_column('conformity_report', sa.Column('input_fingerprint', sa.String(length=32), nullable=True))
+    if 'stale' not in existing:
+        op.add_column('conformity_report', sa.Column('stale', sa.Boolean(), nullable=False,
+                                                     server_default=sa.false()))
+    if 'ix_conformity_report_stale' not in {index['name'] for index in inspector.get_indexes('conformity_report')}:
+        op.create_index('ix_conformity_report_stale', 'conformity_report', ['id'],
+                        sqlite_where=sa.text('stale = 1'))
+
+
+def downgrade():
+    op.drop_index('ix_conformity_report_stale', table_name='conformity_report')
+    with op.batch_alter_table('conformity_report') as batch_op:
+        batch_op.drop_column('stale')
+        batch_op.drop_column('input_fingerprint')
@@ -0,0 +1,73 @@
+"""
+Electrical supply parsing.
+
+Scanner power requirements and site electrical supplies are free text
+("380V 50kVA", "400 V 3-phase 80 kVA", "230V single phase 32A"). They are
+parsed once, when the row is written, into a PowerSpec of plain numbers so
+compatibility checks never touch the strings.
+"""
+
+import math
+import re
+from typing import NamedTuple, Optional
+
+_NUMBER = r'(\d+(?:[.,]\d+)?)'
+# "400V" or a line/phase pair such as "400/230V"
+_VOLTAGE = re.compile(r'(\d+(?:[.,]\d+)?(?:\s*/\s*\d+(?:[.,]\d+)?)*)\s*(k?)v(?![a-z])', re.I)
+_APPARENT_POWER = re.compile(_NUMBER + r'\s*([km])va\b', re.I)
+_REAL_POWER = re.compile(_NUMBER + r'\s*([km])w\b', re.I)
+_CURRENT = re.compile(_NUMBER + r'\s*a(?:mps?)?\b', re.I)
+_THREE_PHASE = re.compile(r'\b(?:3|three|tri)[\s-]*(?:phase|ph)\b|3\s*~|\b3p\b', re.I)
+_SINGLE_PHASE = re.compile(r'\b(?:1|single|mono)[\s-]*(?:phase|ph)\b|1\s*~|\b1p\b', re.I)
+
+_SCALE = {'k': 1.0, 'm': 1000.0}  # to kVA / kW
+
+# Line voltages of 380 V and above only occur on three-phase distribution
+THREE_PHASE_MIN_VOLTAGE = 380.0
+
+
+class PowerSpec(NamedTuple):
+    voltage: Optional[float] = None  # V
+    kva: Optional[float] = None      # kVA
+    phase: Optional[int] = None      # 1 or 3
+
+
+def _number(value):
+    return float(value.replace(',', '.'))
+
+
+def parse_power(text):
+    """
+    Parse a supply or requirement string; parts that are not stated are None.
+
+    kW is read as kVA (unity power factor) and a bare current is converted
+    with the stated voltage, so "400V 3ph 125A" gives about 86.6 kVA.
+    """
+    if not text:
+        return PowerSpec()
+
+    voltages = [_number(amount) * (1000.0 if kilo else 1.0)
+                for amounts, kilo in _VOLTAGE.findall(text)
+                for amount in amounts.split('/')]
+    voltage = max(voltages) if voltages else None
+
+    if _THREE_PHASE.search(text):
+        phase = 3
+    elif _SINGLE_PHASE.search(text):
+        phase = 1
+    elif voltage is not None and voltage >= THREE_PHASE_MIN_VOLTAGE:
+        phase = 3
+    else:
+        phase = None
+
+    kva = None
+    match = _APPARENT_POWER.search(text) or _REAL_POWER.search(text)
+    if match:
+        kva = _number(match.group(1)) * _SCALE[match.group(2).lower()]
+    elif voltage is not None:
+        match = _CURRENT.search(text)
+        if match:
+            factor = math.sqrt(3) if phase == 3 else 1.0
+            kva = round(voltage * _number(match.group(1)) * factor / 1000.0, 1)
+
+    return PowerSpec(voltage=voltage, kva=kva, phase=phase)
@@ -0,0 +1,108 @@
+"""
+Per-project rollups in ``project_summary``.
+
+One row per project holds its site count, report count, pass/fail counts,
+best conformity score and total estimated cost. SQLite triggers on
+project, site_specification and conformity_report adjust the row as rows
+are written, so ORM writes, bulk Core inserts and raw SQL all keep it
+current and list pages read the numbers without aggregating. The best
+score is recomputed for the project only when its current best is
+removed or lowered.
+"""
+
+TABLE = 'project_summary'
+COLUMNS = ('site_count', 'report_count', 'pass_count', 'fail_count',
+           'best_score', 'total_estimated_cost')
+
+
+def refresh_sql(where='1'):
+    """Recompute the summary rows of the projects matching `where` (on `p`)"""
+    return (
+        f"INSERT OR REPLACE INTO {TABLE} (project_id, {', '.join(COLUMNS)}) "
+        "SELECT p.id, "
+        "(SELECT count(*) FROM site_specification WHERE project_id = p.id), "
+        "count(r.id), "
+        "coalesce(sum(r.pass_fail IS 1), 0), "
+        "coalesce(sum(r.pass_fail IS 0), 0), "
+        "max(r.conformity_score), "
+        "coalesce(sum(r.estimated_cost), 0) "
+        "FROM project p "
+        "LEFT JOIN site_specification s ON s.project_id = p.id "
+        "LEFT JOIN conformity_report r ON r.site_spec_id = s.id "
+        f"WHERE {where} GROUP BY p.id"
+    )
+
+
+def _project_of(site_id):
+    return f'(SELECT project_id FROM site_specification WHERE id = {site_id})'
+
+
+def _add_report(row):
+    return (
+        f"UPDATE {TABLE} SET "
+        "report_count = report_count + 1, "
+        f"pass_count = pass_count + ({row}.pass_fail IS 1), "
+        f"fail_count = fail_count + ({row}.pass_fail IS 0), "
+        f"best_score = max(coalesce(best_score, {row}.conformity_score), "
+        f"coalesce({row}.conformity_score, best_score)), "
+        f"total_estimated_cost = total_estimated_cost + coalesce({row}.estimated_cost, 0) "
+        f"WHERE project_id = {_project_of(f'{row}.site_spec_id')};"
+    )
+
+
+def _remove_report(row):
+    # CASE evaluates lazily: the project's reports are only scanned when the
+    # removed score may have been the best one
+    return (
+        f"UPDATE {TABLE} SET "
+        "report_count = report_count - 1, "
+        f"pass_count = pass_count - ({row}.pass_fail IS 1), "
+        f"fail_count = fail_count - ({row}.pass_fail IS 0), "
+        f"best_score = CASE WHEN {row}.conformity_score IS NULL "
+        f"OR {row}.conformity_score < best_score THEN best_score ELSE ("
+        "SELECT max(r.conformity_score) FROM conformity_report r "
+        "JOIN site_specification s ON s.id = r.site_spec_id "
+        f"WHERE s.project_id = {TABLE}.project_id) END, "
+        f"total_estimated_cost = total_estimated_cost - coalesce({row}.estimated_cost, 0) "
+        f"WHERE project_id = {_project_of(f'{row}.site_spec_id')};"
+    )
+
+
+def ddl():
+    """CREATE statements for the maintaining triggers, then a fill of missing rows"""
+    report_changed = ' OR '.join(f'old.{name} IS NOT new.{name}' for name in (
+        'conformity_score', 'pass_fail', 'estimated_cost', 'site_spec_id'))
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_project_ai AFTER INSERT ON project "
+        f"BEGIN INSERT OR IGNORE INTO {TABLE} (project_id) VALUES (new.id); END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_project_ad AFTER DELETE ON project "
+        f"BEGIN DELETE FROM {TABLE} WHERE project_id = old.id; END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_site_ai AFTER INSERT ON site_specification "
+        f"BEGIN UPDATE {TABLE} SET site_count = site_count + 1 "
+        "WHERE project_id = new.project_id; END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_site_ad AFTER DELETE ON site_specification "
+        f"BEGIN UPDATE {TABLE} SET site_count = site_count - 1 "
+        "WHERE project_id = old.project_id; END",
+        # A site moving project takes its reports along; rare, so recount both
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_site_au AFTER UPDATE OF project_id "
+        "ON site_specification WHEN old.project_id IS NOT new.project_id "
+        f"BEGIN {refresh_sql('p.id IN (old.project_id, new.project_id)')}; END",
+
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_report_ai AFTER INSERT ON conformity_report "
+        f"BEGIN {_add_report('new')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_report_ad AFTER DELETE ON conformity_report "
+        f"BEGIN {_remove_report('old')} END",
+        f"CREATE TRIGGER IF NOT EXISTS {TABLE}_report_au AFTER UPDATE OF "
+        "conformity_score, pass_fail, estimated_cost, site_spec_id ON conformity_report "
+        f"WHEN {report_changed} "
+        f"BEGIN {_remove_report('old')} {_add_report('new')} END",
+
+        refresh_sql(f'p.id NOT IN (SELECT project_id FROM {TABLE})'),
+    ]
+
+
+def drop_ddl():
+    return [f'DROP TRIGGER IF EXISTS {TABLE}_{suffix}' for suffix in (
+        'project_ai', 'project_ad', 'site_ai', 'site_ad', 'site_au',
+        'report_ai', 'report_ad', 'report_au')]
@@ -1,6 +1,8 @@
-from app import app, db
+from app import create_app, appbuilder, db
 from flask_appbuilder.security.sqla.models import User
 
+app = create_app()
+
 with app.app_context():
     # Delete all users
     users = db.session.query(User).all()
@@ -10,6 +12,6 @@ with app.app_context():
     db.session.commit()
     print("✅ All users deleted")
 
-user = appbuilder.sm.find_user(username='admin')
-appbuilder.sm.reset_password(user, 'newpassword123')
-db.session.commit()
\ No newline at end of file
+    user = appbuilder.sm.find_user(username='admin')
+    appbuilder.sm.reset_password(user, 'newpassword123')
+    db.session.commit()
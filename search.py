@@ -0,0 +1,74 @@
+"""
+SQLite FTS5 search over projects and scanner models.
+
+Each indexed table gets an external-content FTS5 table (``<table>_fts``)
+holding only the index, kept in step with the base table by triggers, so
+ORM writes, bulk Core inserts and raw SQL all stay searchable. User input
+is turned into a prefix query: every word must match the start of a token
+in any indexed column.
+"""
+
+import re
+from typing import NamedTuple
+
+
+class SearchIndex(NamedTuple):
+    table: str
+    columns: tuple
+    weights: tuple  # bm25 weight per column, higher ranks matches above others
+
+    @property
+    def fts_table(self):
+        return f'{self.table}_fts'
+
+    def ddl(self):
+        """CREATE statements for the FTS table and its sync triggers"""
+        columns = ', '.join(self.columns)
+        new_values = ', '.join(f'new.{name}' for name in self.columns)
+        old_values = ', '.join(f'old.{name}' for name in self.columns)
+        fts = self.fts_table
+        delete = (f"INSERT INTO {fts}({fts}, rowid, {columns}) "
+                  f"VALUES ('delete', old.id, {old_values});")
+        insert = f'INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});'
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, "
+            f"content='{self.table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {self.table} BEGIN {insert} END',
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {self.table} BEGIN {delete} END',
+            f'CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {self.table} '
+            f'BEGIN {delete} {insert} END',
+        ]
+
+    def drop_ddl(self):
+        fts = self.fts_table
+        return [f'DROP TRIGGER IF EXISTS {fts}_{suffix}' for suffix in ('ai', 'ad', 'au')] + \
+            [f'DROP TABLE IF EXISTS {fts}']
+
+    def rebuild_sql(self):
+        """Re-index every base row, for tables that held data before the index"""
+        return f"INSERT INTO {self.fts_table}({self.fts_table}) VALUES ('rebuild')"
+
+    def rank_sql(self):
+        weights = ', '.join(str(weight) for weight in self.weights)
+        return f'bm25({self.fts_table}, {weights})'
+
+
+PROJECT_INDEX = SearchIndex(
+    'project', ('name', 'client_name', 'engineer_name', 'description'), (10.0, 5.0, 5.0, 1.0))
+SCANNER_INDEX = SearchIndex(
+    'scanner_model', ('name', 'manufacturer', 'special_requirements'), (10.0, 5.0, 1.0))
+INDEXES = (PROJECT_INDEX, SCANNER_INDEX)
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def match_query(text):
+    """
+    FTS5 MATCH expression for free text: each word as a quoted prefix
+    term, all required. Returns None when `text` has no words.
+    """
+    words = _WORD.findall(text or '')
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
@@ -0,0 +1,141 @@
+"""
+Deterministic sample data.
+
+SCANNER_CATALOG is the canonical scanner list loaded by create_sample_data
+and the `seed` command. The generators build benchmark-sized projects and
+sites from a seed: every project draws from its own RNG, seeded by
+(seed, project index), so a run that stops halfway can be resumed and any
+batch size produces the same rows.
+"""
+
+import numpy as np
+
+import power_spec
+
+SCANNER_CATALOG = (
+    {
+        'name': 'NeuViz ACE',
+        'manufacturer': 'Neusoft Medical Systems',
+        'weight': 1400,
+        'min_room_length': 6.5,
+        'min_room_width': 4.2,
+        'min_room_height': 2.43,
+        'min_door_width': 1.2,
+        'power_requirement': '380V 50kVA',
+        'special_requirements': 'Neusoft engineer required, Enhanced grounding, Temperature ±4.1°C/h, NPS-CT-0651 compliance',
+    },
+    {
+        'name': 'NeuViz ACE SP',
+        'manufacturer': 'Neusoft Medical Systems',
+        'weight': 1450,
+        'min_room_length': 6.8,
+        'min_room_width': 4.5,
+        'min_room_height': 2.43,
+        'min_door_width': 1.2,
+        'power_requirement': '380V 55kVA',
+        'special_requirements': 'Neusoft engineer required, Enhanced grounding, Temperature ±4.1°C/h, NPS-CT-0651 compliance',
+    },
+    {
+        'name': 'GE Revolution CT',
+        'manufacturer': 'GE HealthCare',
+        'weight': 1850,
+        'min_room_length': 7.0,
+        'min_room_width': 4.8,
+        'min_room_height': 2.5,
+        'min_door_width': 1.3,
+        'power_requirement': '400V 80kVA',
+        'special_requirements': 'Water cooling required, Advanced shielding, Revolution platform',
+    },
+    {
+        'name': 'Siemens SOMATOM',
+        'manufacturer': 'Siemens Healthineers',
+        'weight': 1750,
+        'min_room_length': 6.8,
+        'min_room_width': 4.5,
+        'min_room_height': 2.4,
+        'min_door_width': 1.25,
+        'power_requirement': '480V 75kVA',
+        'special_requirements': 'Seismic isolation recommended, EMC testing required, Quantum technology',
+    },
+)
+
+PROJECT_NAME_PREFIX = 'Seed project'
+STATUSES = ('draft', 'planning', 'in_progress', 'completed')
+CLIENTS = ('Central Hospital', 'University Clinic', 'Regional Medical Center',
+           'Cardiology Institute', 'Private Imaging Center')
+ENGINEERS = ('A. Martin', 'B. Nguyen', 'C. Rossi', 'D. Okafor', 'E. Schmidt')
+SUPPLIES = ('380V 60kVA', '400V 3ph 125A', '400V 100kVA', '480V 80kVA', '230V single phase 32A', None)
+HVAC_SYSTEMS = ('Split system', 'Central AHU', 'Precision cooling', None)
+
+# (low, high) per generated column; ranges straddle the catalog minimums so
+# the seeded sites mix passes and failures
+SITE_RANGES = {
+    'room_length': (5.5, 9.0),
+    'room_width': (3.8, 6.5),
+    'room_height': (2.3, 3.4),
+    'door_width': (1.0, 1.6),
+    'door_height': (1.9, 2.5),
+    'floor_capacity': (500.0, 2000.0),
+}
+
+_PARSED_SUPPLIES = [power_spec.parse_power(text) for text in SUPPLIES]
+
+
+def scanner_mappings():
+    """SCANNER_CATALOG rows with the parsed power columns filled in"""
+    rows = []
+    for scanner in SCANNER_CATALOG:
+        spec = power_spec.parse_power(scanner['power_requirement'])
+        rows.append(dict(scanner, power_voltage=spec.voltage, power_kva=spec.kva,
+                         power_phase=spec.phase))
+    return rows
+
+
+def project_name(index):
+    return f'{PROJECT_NAME_PREFIX} {index + 1:06d}'
+
+
+def sites_for_project(index, projects, sites):
+    """How many of `sites` project `index` gets when spread evenly over `projects`"""
+    base, extra = divmod(sites, projects)
+    return base + (1 if index < extra else 0)
+
+
+def first_site_index(index, projects, sites):
+    """Global position of project `index`'s first site"""
+    base, extra = divmod(sites, projects)
+    return index * base + min(index, extra)
+
+
+def generate_project(seed, index, site_count):
+    """
+    One project and its sites: returns (project values, site value dicts).
+    Sites have no project_id yet.
+    """
+    rng = np.random.default_rng([seed, index])
+    project = {
+        'name': project_name(index),
+        'status': STATUSES[rng.integers(len(STATUSES))],
+        'client_name': CLIENTS[rng.integers(len(CLIENTS))],
+        'engineer_name': ENGINEERS[rng.integers(len(ENGINEERS))],
+        'description': f'Generated with seed {seed}',
+    }
+
+    columns = {name: np.round(rng.uniform(low, high, site_count), 2).tolist()
+               for name, (low, high) in SITE_RANGES.items()}
+    supplies = rng.integers(len(SUPPLIES), size=site_count).tolist()
+    hvac = rng.integers(len(HVAC_SYSTEMS), size=site_count).tolist()
+
+    sites = []
+    for i in range(site_count):
+        spec = _PARSED_SUPPLIES[supplies[i]]
+        site = {name: values[i] for name, values in columns.items()}
+        site.update(
+            electrical_power=SUPPLIES[supplies[i]],
+            hvac_system=HVAC_SYSTEMS[hvac[i]],
+            supply_voltage=spec.voltage,
+            supply_kva=spec.kva,
+            supply_phase=spec.phase,
+        )
+        sites.append(site)
+    return project, sites
@@ -3,23 +3,16 @@
 # Replace your simple_admin.py with this version
 # ================================================
 
-from flask import Flask, redirect, url_for, render_template_string
+from flask import Blueprint, Flask, current_app, redirect, url_for, render_template
 from flask_sqlalchemy import SQLAlchemy
 from flask_admin import Admin, BaseView, expose, AdminIndexView
 from flask_admin.contrib.sqla import ModelView
 from datetime import datetime
 import os
 
-# Create Flask app
-app = Flask(__name__)
-
-# Configuration
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', os.urandom(24).hex())
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///ct_scanner_simple.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-
-# Initialize extensions
-db = SQLAlchemy(app)
+# Bound to an app in create_app
+db = SQLAlchemy()
+bp = Blueprint('main', __name__)
 
 # ================================================
 # MODELS
@@ -107,189 +100,49 @@ class CTScannerAdminIndexView(AdminIndexView):
         scanner_count = ScannerModel.query.count()
         site_count = SiteSpecification.query.count()
         
-        # Simple dashboard template with correct links
-        dashboard_template = '''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>CT Scanner Manager</title>
-            <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
-            <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
-            <style>
-                .sidebar { background: #2c3e50; }
-                .nav-link:hover { background: rgba(255,255,255,0.1); }
-                .card { transition: transform 0.2s; }
-                .card:hover { transform: translateY(-5px); }
-            </style>
-        </head>
-        <body>
-            <div class="container-fluid">
-                <div class="row">
-                    <div class="col-md-2 sidebar text-white min-vh-100">
-                        <h4 class="p-3">🏥 CT Scanner</h4>
-                        <ul class="nav nav-pills flex-column">
-                            <li class="nav-item">
-                                <a class="nav-link text-white" href="/admin/project/">
-                                    <i class="fas fa-folder"></i> Projects ({{ project_count }})
-                                </a>
-                            </li>
-                            <li class="nav-item">
-                                <a class="nav-link text-white" href="/admin/scannermodel/">
-                                    <i class="fas fa-cogs"></i> Scanner Models ({{ scanner_count }})
-                                </a>
-                            </li>
-                            <li class="nav-item">
-                                <a class="nav-link text-white" href="/admin/sitespecification/">
-                                    <i class="fas fa-building"></i> Site Specifications ({{ site_count }})
-                                </a>
-                            </li>
-                            <li class="nav-item">
-                                <hr class="text-white">
-                            </li>
-                            <li class="nav-item">
-                                <a class="nav-link text-white" href="/create-sample-data">
-                                    <i class="fas fa-database"></i> Load Sample Data
-                                </a>
-                            </li>
-                            <li class="nav-item">
-                                <a class="nav-link text-white" href="/test">
-                                    <i class="fas fa-flask"></i> System Test
-                                </a>
-                            </li>
-                        </ul>
-                    </div>
-                    <div class="col-md-10">
-                        <div class="p-4">
-                            <h1>🎯 CT Scanner Preinstallation Manager</h1>
-                            <p class="lead">Professional CT scanner project management and compliance system</p>
-                            
-                            <div class="row mb-4">
-                                <div class="col-md-4">
-                                    <div class="card border-primary h-100">
-                                        <div class="card-body text-center">
-                                            <i class="fas fa-folder fa-3x text-primary mb-3"></i>
-                                            <h3 class="text-primary">{{ project_count }}</h3>
-                                            <h5>Projects</h5>
-                                            <p class="small">Manage CT scanner installation projects</p>
-                                            <a href="/admin/project/" class="btn btn-primary">View Projects</a>
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="col-md-4">
-                                    <div class="card border-success h-100">
-                                        <div class="card-body text-center">
-                                            <i class="fas fa-cogs fa-3x text-success mb-3"></i>
-                                            <h3 class="text-success">{{ scanner_count }}</h3>
-                                            <h5>Scanner Models</h5>
-                                            <p class="small">NeuViz, GE, Siemens specifications</p>
-                                            <a href="/admin/scannermodel/" class="btn btn-success">View Scanners</a>
-                                        </div>
-                                    </div>
-                                </div>
-                                <div class="col-md-4">
-                                    <div class="card border-info h-100">
-                                        <div class="card-body text-center">
-                                            <i class="fas fa-building fa-3x text-info mb-3"></i>
-                                            <h3 class="text-info">{{ site_count }}</h3>
-                                            <h5>Site Specifications</h5>
-                                            <p class="small">Room dimensions & requirements</p>
-                                            <a href="/admin/sitespecification/" class="btn btn-info">View Sites</a>
-                                        </div>
-                                    </div>
-                                </div>
-                            </div>
-                            
-                            <div class="row">
-                                <div class="col-md-6">
-                                    <h5>🚀 Quick Actions</h5>
-                                    <div class="d-grid gap-2">
-                                        <a href="/admin/project/new/" class="btn btn-primary">
-                                            <i class="fas fa-plus"></i> New Project
-                                        </a>
-                                        <a href="/create-sample-data" class="btn btn-warning">
-                                            <i class="fas fa-database"></i> Load Sample Scanners
-                                        </a>
-                                        <a href="/test" class="btn btn-secondary">
-                                            <i class="fas fa-flask"></i> System Test
-                                        </a>
-                                    </div>
-                                </div>
-                                <div class="col-md-6">
-                                    <h5>✅ System Status</h5>
-                                    <ul class="list-group">
-                                        <li class="list-group-item d-flex justify-content-between">
-                                            <span>Database</span>
-                                            <span class="badge bg-success">Connected</span>
-                                        </li>
-                                        <li class="list-group-item d-flex justify-content-between">
-                                            <span>Admin Interface</span>
-                                            <span class="badge bg-success">Working</span>
-                                        </li>
-                                        <li class="list-group-item d-flex justify-content-between">
-                                            <span>AI Integration</span>
-                                            <span class="badge bg-warning">Step 3</span>
-                                        </li>
-                                        <li class="list-group-item d-flex justify-content-between">
-                                            <span>NeuViz Support</span>
-                                            <span class="badge bg-success">Ready</span>
-                                        </li>
-                                    </ul>
-                                </div>
-                            </div>
-                            
-                            <div class="mt-4 p-3 bg-light rounded">
-                                <h6><i class="fas fa-info-circle"></i> Step 2 Complete!</h6>
-                                <p class="mb-0">✅ Project management, scanner database, and admin interface are working. Ready for <strong>Step 3: AI Integration</strong>!</p>
-                            </div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </body>
-        </html>
-        '''
-        
-        return render_template_string(dashboard_template,
-                                    project_count=project_count,
-                                    scanner_count=scanner_count,
-                                    site_count=site_count)
+        return render_template('simple_dashboard.html',
+                               project_count=project_count,
+                               scanner_count=scanner_count,
+                               site_count=site_count)
 
 # ================================================
 # INITIALIZE ADMIN WITH EXPLICIT ENDPOINTS
 # ================================================
 
-admin = Admin(
-    app, 
-    name='CT Scanner Manager', 
-    template_mode='bootstrap4',
-    index_view=CTScannerAdminIndexView(url='/admin')
-)
+def init_admin(app):
+    admin = Admin(
+        app, 
+        name='CT Scanner Manager', 
+        template_mode='bootstrap4',
+        index_view=CTScannerAdminIndexView(url='/admin')
+    )
 
-# Add views with explicit endpoints and URLs
-admin.add_view(ProjectView(Project, db.session, 
-                          name='Projects', 
-                          endpoint='project',
-                          url='/admin/project'))
+    # Add views with explicit endpoints and URLs
+    admin.add_view(ProjectView(Project, db.session, 
+                              name='Projects', 
+                              endpoint='project',
+                              url='/admin/project'))
 
-admin.add_view(ScannerModelView(ScannerModel, db.session, 
-                               name='Scanner Models', 
-                               endpoint='scannermodel',
-                               url='/admin/scannermodel'))
+    admin.add_view(ScannerModelView(ScannerModel, db.session, 
+                                   name='Scanner Models', 
+                                   endpoint='scannermodel',
+                                   url='/admin/scannermodel'))
 
-admin.add_view(SiteSpecificationView(SiteSpecification, db.session, 
-                                    name='Site Specifications', 
-                                    endpoint='sitespecification',
-                                    url='/admin/sitespecification'))
+    admin.add_view(SiteSpecificationView(SiteSpecification, db.session, 
+                                        name='Site Specifications', 
+                                        endpoint='sitespecification',
+                                        url='/admin/sitespecification'))
+    return admin
 
 # ================================================
 # ROUTES
 # ================================================
 
-@app.route('/')
+@bp.route('/')
 def index():
     return redirect(url_for('admin.index'))
 
-@app.route('/test')
+@bp.route('/test')
 def test():
     project_count = Project.query.count()
     scanner_count = ScannerModel.query.count()
@@ -313,7 +166,7 @@ def test():
     <p><a href="/create-sample-data">Load Sample Data</a></p>
     '''
 
-@app.route('/create-sample-data')
+@bp.route('/create-sample-data')
 def create_sample_data():
     # Create NeuViz scanners if they don't exist
     if ScannerModel.query.count() == 0:
@@ -382,24 +235,40 @@ def create_sample_data():
     </ul>
     '''
 
-@app.route('/debug-routes')
+@bp.route('/debug-routes')
 def debug_routes():
     """Show all available routes for debugging"""
     output = ["<h2>🔍 Available Routes</h2>"]
-    for rule in app.url_map.iter_rules():
+    for rule in current_app.url_map.iter_rules():
         methods = ','.join(rule.methods - {'HEAD', 'OPTIONS'})
         output.append(f"<strong>{rule.endpoint}</strong>: {rule.rule} [{methods}]")
     return "<br>".join(sorted(output))
 
 # ================================================
-# INITIALIZE DATABASE
+# APP FACTORY
 # ================================================
 
-with app.app_context():
-    db.create_all()
-    print("✅ Database created successfully")
+def create_app():
+    """Build the simple admin app; nothing is created at import time"""
+    app = Flask(__name__)
+
+    # Configuration
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', os.urandom(24).hex())
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///ct_scanner_simple.db'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+    db.init_app(app)
+    init_admin(app)
+    app.register_blueprint(bp)
+    return app
 
 if __name__ == '__main__':
+    app = create_app()
+    # Schema is created for the dev server only, not on import
+    with app.app_context():
+        db.create_all()
+        print("✅ Database created successfully")
+
     print("🚀 Starting CT Scanner Manager...")
     print("🔧 Admin dashboard: http://localhost:5000/admin/")
     print("📊 Load sample data: http://localhost:5000/create-sample-data")
@@ -0,0 +1,156 @@
+"""
+Streaming reader and validator for site specification spreadsheets.
+
+Rows come from .xlsx (openpyxl read-only mode) or .csv files one at a time.
+Memory use of a .csv import does not grow with the sheet; for .xlsx,
+openpyxl's read-only parser keeps a cleared element per row read (about
+80 bytes). Header cells are matched to SiteSpecification columns
+case-insensitively, with spaces and dashes read as underscores; the
+project is given by name (`project`) or id (`project_id`).
+"""
+
+import csv
+import io
+import math
+from itertools import islice
+
+from openpyxl import load_workbook
+
+import power_spec
+
+REQUIRED_FIELDS = ('room_length', 'room_width', 'room_height')
+OPTIONAL_NUMBER_FIELDS = ('door_width', 'door_height', 'floor_capacity')
+TEXT_FIELDS = {'electrical_power': 100, 'hvac_system': 100}  # column: max length
+PROJECT_FIELDS = ('project', 'project_id')
+
+HEADER_ALIASES = {
+    'project_name': 'project',
+    'length': 'room_length',
+    'width': 'room_width',
+    'height': 'room_height',
+    'electrical': 'electrical_power',
+    'power': 'electrical_power',
+    'hvac': 'hvac_system',
+}
+
+
+class ImportFormatError(ValueError):
+    """The file as a whole cannot be read (unknown type, missing columns)"""
+
+
+def normalize_header(value):
+    if value is None:
+        return None
+    name = str(value).strip().lower().replace(' ', '_').replace('-', '_')
+    return HEADER_ALIASES.get(name, name)
+
+
+def _xlsx_rows(stream):
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        yield from workbook.active.iter_rows(values_only=True)
+    finally:
+        workbook.close()
+
+
+def _csv_rows(stream):
+    if isinstance(stream, io.TextIOBase):
+        text = stream
+    else:
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    yield from csv.reader(text)
+
+
+def read_rows(stream, filename):
+    """
+    Yield (row_number, {header: value}) for each non-empty data row.
+    Row numbers are 1-based sheet rows, counting the header as row 1.
+    """
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension in ('xlsx', 'xlsm'):
+        rows = _xlsx_rows(stream)
+    elif extension == 'csv':
+        rows = _csv_rows(stream)
+    else:
+        raise ImportFormatError(f'Unsupported file type {filename!r}; use .xlsx or .csv')
+
+    header = next(rows, None)
+    if header is None:
+        raise ImportFormatError('The file is empty')
+    names = [normalize_header(cell) for cell in header]
+    missing = [field for field in REQUIRED_FIELDS if field not in names]
+    if missing:
+        raise ImportFormatError(f'Missing required columns: {", ".join(missing)}')
+    if not any(field in names for field in PROJECT_FIELDS):
+        raise ImportFormatError('Missing a project or project_id column')
+
+    for row_number, row in enumerate(rows, start=2):
+        if not any(cell not in (None, '') for cell in row):
+            continue
+        yield row_number, {name: value for name, value in zip(names, row) if name}
+
+
+def _number(row, field, required):
+    value = row.get(field)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise ValueError(f'{field} is required')
+        return None
+    try:
+        number = float(str(value).strip().replace(',', '.')) if isinstance(value, str) else float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} is not a number: {value!r}')
+    if not math.isfinite(number) or number <= 0:
+        raise ValueError(f'{field} must be a positive number')
+    return number
+
+
+def validate_row(row):
+    """
+    Turn one sheet row into SiteSpecification values. The project stays as
+    `project_id` (int) or `project` (name) for the caller to resolve.
+    Raises ValueError listing every problem in the row.
+    """
+    values, errors = {}, []
+
+    for field in REQUIRED_FIELDS + OPTIONAL_NUMBER_FIELDS:
+        try:
+            values[field] = _number(row, field, field in REQUIRED_FIELDS)
+        except ValueError as ex:
+            errors.append(str(ex))
+
+    for field, max_length in TEXT_FIELDS.items():
+        value = row.get(field)
+        value = str(value).strip() if value is not None else ''
+        if len(value) > max_length:
+            errors.append(f'{field} is longer than {max_length} characters')
+        values[field] = value or None
+
+    project_id = row.get('project_id')
+    project = row.get('project')
+    if project_id not in (None, ''):
+        try:
+            values['project_id'] = int(float(project_id))
+        except (TypeError, ValueError):
+            errors.append(f'project_id is not a number: {project_id!r}')
+    elif project not in (None, '') and str(project).strip():
+        values['project'] = str(project).strip()
+    else:
+        errors.append('project is required')
+
+    if errors:
+        raise ValueError('; '.join(errors))
+
+    # bulk_insert_mappings skips the @validates hook that fills these
+    spec = power_spec.parse_power(values['electrical_power'])
+    values.update(supply_voltage=spec.voltage, supply_kva=spec.kva, supply_phase=spec.phase)
+    return values
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
@@ -0,0 +1,32 @@
+"""
+SQLite connection tuning.
+
+Applies the ``SQLITE_PRAGMAS`` mapping of the active config class to every
+new DBAPI connection, so pooled connections share WAL journaling, a busy
+timeout and larger page/mmap caches instead of SQLite's defaults.
+"""
+
+from sqlalchemy import event
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+    finally:
+        cursor.close()
+
+
+def init_app(app, db):
+    """Register the pragma hook on the app's engine when it is SQLite"""
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if not pragmas or not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        return
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        apply_pragmas(dbapi_connection, pragmas)
@@ -3,25 +3,32 @@
 # Let's start with the absolute basics that MUST work
 # ================================================
 
-from flask import Flask
+from flask import Flask, current_app
 from flask_appbuilder import AppBuilder, SQLA
 import os
 
-# Create Flask app
-app = Flask(__name__)
+db = SQLA()
+appbuilder = AppBuilder()
 
-# Minimal configuration
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', os.urandom(24).hex())
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///minimal_test.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+def create_app():
+    """Build the minimal app; nothing is created at import time"""
+    app = Flask(__name__)
 
-# Initialize SQLA
-db = SQLA(app)
+    # Minimal configuration
+    app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', os.urandom(24).hex())
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///minimal_test.db'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# Initialize AppBuilder - This should create admin routes
-appbuilder = AppBuilder(app, db.session)
+    with app.app_context():
+        # Initialize SQLA
+        db.init_app(app)
+        # Initialize AppBuilder - This should create admin routes
+        appbuilder.init_app(app, db.session)
+
+    app.add_url_rule('/', 'index', index)
+    app.add_url_rule('/debug-routes', 'debug_routes', debug_routes)
+    return app
 
-@app.route('/')
 def index():
     return '''
     <h1>🧪 Minimal Flask-AppBuilder Test</h1>
@@ -30,14 +37,13 @@ def index():
     <p><a href="/debug-routes">Debug Routes</a></p>
     '''
 
-@app.route('/debug-routes')
 def debug_routes():
     """Show all available routes"""
     output = ["<h2>🔍 Available Routes</h2>"]
     admin_routes = []
     other_routes = []
     
-    for rule in app.url_map.iter_rules():
+    for rule in current_app.url_map.iter_rules():
         methods = ','.join(rule.methods - {'HEAD', 'OPTIONS'})
         route_info = f"<strong>{rule.endpoint}</strong>: {rule.rule} [{methods}]"
         
@@ -57,12 +63,13 @@ def debug_routes():
     
     return "<br>".join(output)
 
-# Create database tables
-with app.app_context():
-    db.create_all()
-    print("✅ Minimal database created")
-
 if __name__ == '__main__':
+    app = create_app()
+    # Create database tables
+    with app.app_context():
+        db.create_all()
+        print("✅ Minimal database created")
+
     print("🧪 Testing minimal Flask-AppBuilder setup...")
     print("🌐 Visit: http://localhost:5000")
     print("🔧 Admin: http://localhost:5000/admin/")
@@ -0,0 +1,22 @@
+"""
+WSGI entry point for production servers::
+
+    gunicorn            # reads gunicorn.conf.py, which serves wsgi:app
+
+The app/ package shadows app.py as ``app``, so app.py is loaded by path.
+FLASK_ENV defaults to production here.
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+_spec = importlib.util.spec_from_file_location('ct_app', os.path.join(ROOT, 'app.py'))
+ct_app = importlib.util.module_from_spec(_spec)
+sys.modules['ct_app'] = ct_app
+_spec.loader.exec_module(ct_app)
+
+app = ct_app.create_app(os.environ.get('FLASK_ENV', 'production'))
+db = ct_app.db